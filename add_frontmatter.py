@@ -14,25 +14,43 @@ For future releases, llamabot will create files in docs/releases/posts/ and they
 need frontmatter added manually or via this script.
 """
 
+import re
 import subprocess
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
-def get_git_tag_date(tag: str) -> str:
-    """Get the date and time of a git tag in YYYY-MM-DD HH:MM:SS format."""
+def get_git_tag_dates() -> dict[str, str]:
+    """Get the date and time of every release tag in YYYY-MM-DD HH:MM:SS format.
+
+    Reads all tags with a single ``git for-each-ref`` call instead of running
+    ``git log`` once per tag. Dates are the author date of the tagged commit,
+    dereferencing annotated tags.
+    """
     result = subprocess.run(
-        ["git", "log", "-1", "--format=%ai", tag],
+        [
+            "git",
+            "for-each-ref",
+            "--format=%(refname:strip=2)%09%(authordate:iso)%09%(*authordate:iso)",
+            "refs/tags/v*",
+        ],
         capture_output=True,
         text=True,
         check=True,
     )
-    # Parse timestamp like "2026-01-10 15:51:03 +0000"
-    timestamp_str = result.stdout.strip()
-    # Extract date and time components (ignore timezone for simplicity)
-    date_time_str = " ".join(timestamp_str.split()[:2])
-    dt = datetime.strptime(date_time_str, "%Y-%m-%d %H:%M:%S")
-    return dt.strftime("%Y-%m-%d %H:%M:%S")
+    tag_dates = {}
+    for line in result.stdout.splitlines():
+        tag, commit_date, tagged_commit_date = line.split("\t")
+        # Annotated tags carry the commit date on the dereferenced object
+        timestamp_str = tagged_commit_date or commit_date
+        # Timestamp looks like "2026-01-10 15:51:03 +0000", so the date and time
+        # are the first 19 characters (ignore timezone for simplicity)
+        tag_dates[tag] = timestamp_str[:19]
+    return tag_dates
+
+
+# Closing "---" line of a frontmatter block (surrounding whitespace allowed)
+FRONTMATTER_END = re.compile(r"^[^\S\n]*---[^\S\n]*$", re.MULTILINE)
 
 
 def has_frontmatter(content: str) -> bool:
@@ -40,45 +58,56 @@ def has_frontmatter(content: str) -> bool:
     return content.startswith("---\n")
 
 
-def add_frontmatter(file_path: Path, date: str) -> None:
-    """Add or update blog frontmatter in a release note file."""
+def build_frontmatter(date: str) -> str:
+    """Build the blog frontmatter block for a release note."""
+    return f"""---
+date: {date}
+categories:
+  - Releases
+---
+
+"""
+
+
+def add_frontmatter(file_path: Path, date: str) -> bool:
+    """Add or update blog frontmatter in a release note file.
+
+    Returns:
+        True if the file was rewritten, False if its frontmatter was already
+        up to date.
+    """
+    frontmatter = build_frontmatter(date)
+
+    # Compare just the head of the file so up-to-date files are not fully read
+    frontmatter_bytes = frontmatter.encode("utf-8")
+    with file_path.open("rb") as f:
+        if f.read(len(frontmatter_bytes)) == frontmatter_bytes:
+            return False
+
     # Read existing content
     content = file_path.read_text()
 
     # If has frontmatter, remove it to get the body content
     if has_frontmatter(content):
-        # Find the end of frontmatter (second "---")
-        lines = content.split("\n")
-        end_idx = None
-        for i in range(1, len(lines)):
-            if lines[i].strip() == "---":
-                end_idx = i
-                break
-
-        if end_idx is not None:
+        # Find the end of frontmatter (second "---") without splitting the
+        # whole file into lines; the opening "---\n" is 4 characters
+        end_match = FRONTMATTER_END.search(content, 4)
+
+        if end_match is not None:
             # Extract content after frontmatter (skip closing --- and blank line)
-            body_content = "\n".join(lines[end_idx + 1 :]).lstrip("\n")
+            body_content = content[end_match.end() + 1 :].lstrip("\n")
         else:
             # Malformed frontmatter, use original content
             body_content = content
     else:
         body_content = content
 
-    # Create new frontmatter
-    frontmatter = f"""---
-date: {date}
-categories:
-  - Releases
----
-
-"""
-
     # Combine frontmatter and body
     new_content = frontmatter + body_content
 
     # Write back to file
     file_path.write_text(new_content)
-    print(f"✓ Updated {file_path.name} with timestamp (date: {date})")
+    return True
 
 
 def main():
@@ -90,20 +119,27 @@ def main():
 
     print(f"Found {len(release_files)} release files\n")
 
-    for file_path in release_files:
-        # Extract version from filename (e.g., "v0.1.47" from "v0.1.47.md")
-        version = file_path.stem
-
-        try:
-            # Get git tag date
-            date = get_git_tag_date(version)
-
-            # Add frontmatter
-            add_frontmatter(file_path, date)
+    # Get all git tag dates in one call
+    tag_dates = get_git_tag_dates()
 
-        except subprocess.CalledProcessError:
-            print(f"⚠ Warning: No git tag found for {version}, skipping")
-            continue
+    # Extract version from filename (e.g., "v0.1.47" from "v0.1.47.md")
+    tagged_files = [
+        (file_path, tag_dates[file_path.stem])
+        for file_path in release_files
+        if file_path.stem in tag_dates
+    ]
+    for file_path in release_files:
+        if file_path.stem not in tag_dates:
+            print(f"⚠ Warning: No git tag found for {file_path.stem}, skipping")
+
+    # Files are independent, so read and rewrite them concurrently
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        updated = executor.map(lambda item: add_frontmatter(*item), tagged_files)
+        for (file_path, date), was_updated in zip(tagged_files, updated, strict=True):
+            if was_updated:
+                print(f"✓ Updated {file_path.name} with timestamp (date: {date})")
+            else:
+                print(f"· {file_path.name} already up to date (date: {date})")
 
     print("\n✅ Frontmatter added to all release files!")
 
@@ -27,8 +27,9 @@ image = (
     )
     .pip_install(
         "fastapi[standard]>=0.115.0",
-        "uvicorn>=0.32.0",
+        "uvicorn[standard]>=0.32.0",
         "litellm>=1.50.0",
+        "httpx[http2]>=0.28.1,<0.29",
         "sse-starlette>=2.0.0",
         "pydantic>=2.0.0",
         "exa-py>=1.0.0",
@@ -41,8 +42,11 @@ image = (
         "ruamel.yaml>=0.18.0",
         "youtube-transcript-api>=1.2.3,<2",
     )
-    .add_local_dir("src/canvas_chat", remote_path="/app/canvas_chat")
-    .add_local_file("pyproject.toml", remote_path="/app/pyproject.toml")
+    # Bake the source into the image and byte-compile it at build time, so cold
+    # starts import cached .pyc files instead of compiling every module
+    .add_local_dir("src/canvas_chat", remote_path="/app/canvas_chat", copy=True)
+    .add_local_file("pyproject.toml", remote_path="/app/pyproject.toml", copy=True)
+    .run_commands("python -m compileall -q /app/canvas_chat")
 )
 
 
@@ -55,9 +59,13 @@ image = (
 @modal.asgi_app()
 def fastapi_app():
     """Serve the FastAPI application."""
+    import os
     import sys
 
     sys.path.insert(0, "/app")
+    # Use LiteLLM's bundled model cost map instead of fetching it from GitHub
+    # on every cold start (must be set before litellm is imported)
+    os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "true")
 
     from canvas_chat.app import app as canvas_app
 
@@ -24,14 +24,20 @@ app = typer.Typer(
 
 
 def wait_for_server(host: str, port: int, timeout: float = 10.0) -> bool:
-    """Wait for the server to start accepting connections."""
-    start = time.time()
-    while time.time() - start < timeout:
+    """Wait for the server to start accepting connections.
+
+    Retries with exponential backoff (20ms doubling up to 200ms), so a fast
+    startup is noticed within a few probes without polling a slow one.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.02
+    while time.monotonic() < deadline:
         try:
-            with socket.create_connection((host, port), timeout=0.5):
+            with socket.create_connection((host, port), timeout=0.2):
                 return True
-        except (ConnectionRefusedError, OSError):
-            time.sleep(0.1)
+        except OSError:
+            time.sleep(delay)
+            delay = min(delay * 2, 0.2)
     return False
 
 
@@ -65,6 +71,13 @@ def launch(
         "--admin-mode/--no-admin-mode",
         help="Enable admin mode (server-side API keys, hide user settings)",
     ),
+    workers: int = typer.Option(
+        1,
+        "--workers",
+        envvar="WEB_CONCURRENCY",
+        min=1,
+        help="Number of server processes (use more than 1 for shared deployments)",
+    ),
 ) -> None:
     """Launch the Canvas Chat server."""
     # Load configuration if provided
@@ -107,6 +120,12 @@ def launch(
         os.environ.pop("CANVAS_CHAT_CONFIG_PATH", None)
         os.environ.pop("CANVAS_CHAT_ADMIN_MODE", None)
 
+    # LiteLLM downloads its model cost map from GitHub when it is imported unless
+    # told to use the copy bundled with the package. That blocking request would
+    # sit on every server start, so default to the bundled map; workers inherit
+    # it. Set LITELLM_LOCAL_MODEL_COST_MAP=false to fetch the latest one instead.
+    os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "true")
+
     url = f"http://{host}:{port}"
     typer.echo(f"Starting Canvas Chat at {url}")
 
@@ -118,10 +137,17 @@ def launch(
         )
         browser_thread.start()
 
+    # loop/http "auto" pick uvloop and httptools when installed (uvicorn[standard])
+    # and fall back to asyncio/h11 on platforms without them. Each worker is a
+    # separate process with its own event loop, caches and LLM limits.
     uvicorn.run(
         "canvas_chat.app:app",
         host=host,
         port=port,
+        workers=workers,
+        loop="auto",
+        http="auto",
+        access_log=False,
     )
 
 
@@ -145,7 +171,7 @@ def main(
 ) -> None:
     """Deprecated alias for 'launch' command."""
     typer.echo("⚠️  'main' command is deprecated, use 'launch' instead", err=True)
-    launch(port, host, no_browser, config_path, admin_mode)
+    launch(port, host, no_browser, config_path, admin_mode, workers=1)
 
 
 if __name__ == "__main__":
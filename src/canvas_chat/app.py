@@ -1,7 +1,7 @@
 # /// script
 # dependencies = [
 #     "fastapi>=0.115.0",
-#     "uvicorn>=0.32.0",
+#     "uvicorn[standard]>=0.32.0",
 #     "litellm>=1.50.0",
 #     "sse-starlette>=2.0.0",
 #     "pydantic>=2.0.0",
@@ -17,21 +17,27 @@ merging, and exploration of topics as a DAG.
 
 import asyncio
 import base64
+import hashlib
 import importlib.util
 import json
 import logging
 import os
+import re
 import sys
 import time
-import traceback
+from collections.abc import AsyncIterable, AsyncIterator
+from contextlib import asynccontextmanager
+from email.utils import formatdate
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, TypeVar
+from typing import Annotated, Any, TypeVar
 from uuid import uuid4
 
 import httpx
 import litellm
-from exa_py import Exa
+from exa_py import AsyncExa
 from fastapi import (
+    Depends,
     FastAPI,
     File,
     HTTPException,
@@ -40,14 +46,19 @@ from fastapi import (
     WebSocket,
     WebSocketDisconnect,
 )
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from pydantic_core import to_json
+from sse_starlette import ServerSentEvent
 from sse_starlette.sse import EventSourceResponse
 
 from canvas_chat import __version__
+from canvas_chat.cache import TTLCache, api_key_digest, make_cache_key
 from canvas_chat.config import AppConfig, is_github_copilot_enabled
 from canvas_chat.file_upload_registry import FileUploadRegistry
+from canvas_chat.json_body import document_json_bodies, json_body
+from canvas_chat.llm_limits import LLMLimiter, LLMSaturatedError
 
 # Import built-in file upload handler plugins (registers them)
 # Import built-in URL fetch handler plugins (registers them)
@@ -61,7 +72,9 @@ from canvas_chat.plugins import (
     pptx_handler,  # noqa: F401
     youtube_handler,  # noqa: F401
 )
+from canvas_chat.plugins.matrix_handler import strip_code_fence
 from canvas_chat.plugins.pdf_handler import MAX_PDF_SIZE
+from canvas_chat.shared_cache import SharedCache, create_shared_cache
 from canvas_chat.url_fetch_registry import UrlFetchRegistry
 
 # Configure logging
@@ -71,13 +84,186 @@ logger = logging.getLogger(__name__)
 # Configure litellm
 litellm.drop_params = True  # Drop unsupported params gracefully
 
-app = FastAPI(title="Canvas Chat", version=__version__)
+# Backpressure for upstream LLM calls: calls beyond the concurrency cap queue,
+# with freed slots shared out between API keys in turn. A queue timeout (429
+# once exceeded) and per-key rate limiting are off unless configured.
+_llm_queue_timeout = os.getenv("CANVAS_CHAT_LLM_QUEUE_TIMEOUT")
+llm_limiter = LLMLimiter(
+    max_concurrent=int(os.getenv("CANVAS_CHAT_MAX_CONCURRENT_LLM", "32")),
+    requests_per_minute=int(os.getenv("CANVAS_CHAT_LLM_REQUESTS_PER_MINUTE", "0")),
+    queue_timeout=float(_llm_queue_timeout) if _llm_queue_timeout else None,
+)
+
+# Outbound LLM calls share one keep-alive pool instead of opening a new
+# connection (and TLS handshake) per request. When LiteLLM's aiohttp transport
+# is disabled, the pool is httpx's own, and HTTP/2 multiplexes concurrent
+# streams to the same provider when the h2 package is installed. httpx drops
+# idle connections after 5s by default, shorter than the gap between most chat
+# turns, so idle connections are kept for two minutes instead.
+LLM_HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=64, max_connections=128, keepalive_expiry=120
+)
+LLM_HTTP_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+# Local services (Ollama) are polled on every model list and health check, so
+# keep a few connections to them alive rather than reconnecting each time
+_local_http_client: httpx.AsyncClient | None = None
+
+
+def get_local_http_client() -> httpx.AsyncClient:
+    """Return the shared client for local services, creating it on first use."""
+    global _local_http_client
+    if _local_http_client is None or _local_http_client.is_closed:
+        _local_http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=300),
+            timeout=httpx.Timeout(2.0),
+        )
+    return _local_http_client
+
+
+def litellm_aiohttp_transport() -> httpx.AsyncBaseTransport | None:
+    """Return LiteLLM's aiohttp transport, or None to use httpx's own pool.
+
+    LiteLLM exposes its transport choice only through private helpers on
+    AsyncHTTPHandler. They are looked up defensively so that a LiteLLM release
+    that moves or changes them falls back to the default transport instead of
+    breaking startup.
+    """
+    try:
+        from litellm.llms.custom_httpx.http_handler import AsyncHTTPHandler
+    except ImportError:
+        return None
+    should_use = getattr(AsyncHTTPHandler, "_should_use_aiohttp_transport", None)
+    create = getattr(AsyncHTTPHandler, "_create_async_transport", None)
+    if should_use is None or create is None:
+        logger.warning("LiteLLM transport helpers not found; using httpx pool")
+        return None
+    try:
+        return create() if should_use() else None
+    except Exception as e:
+        logger.warning("LiteLLM aiohttp transport failed (%s); using httpx pool", e)
+        return None
+
+
+def create_llm_http_client() -> httpx.AsyncClient:
+    """Create the shared client for outbound LLM calls.
+
+    Follows LiteLLM's transport choice: its aiohttp transport by default, which
+    handles many concurrent requests with lower latency than httpx's own pool.
+    With ``DISABLE_AIOHTTP_TRANSPORT=True``, or if LiteLLM's transport cannot be
+    created, the native httpx pool is used instead, with HTTP/2 when h2 is
+    installed.
+    """
+    transport = litellm_aiohttp_transport()
+    if transport is not None:
+        return httpx.AsyncClient(
+            transport=transport,
+            timeout=LLM_HTTP_TIMEOUT,
+            follow_redirects=True,
+        )
+    return httpx.AsyncClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=LLM_HTTP_LIMITS,
+        timeout=LLM_HTTP_TIMEOUT,
+    )
+
+
+async def warm_up_llm() -> None:
+    """Pay one-time LLM setup costs at startup instead of on the first request.
+
+    Loads the default tokenizer, which short token counts otherwise load on the
+    event loop. With ``CANVAS_CHAT_WARMUP_LLM=true`` in admin mode, also sends
+    each configured model a one-token request to open its connection and
+    surface bad credentials early. These calls are billed, so they are opt-in.
+    """
+    await asyncio.to_thread(litellm.token_counter, model="openai/gpt-4o", text=".")
+
+    if os.getenv("CANVAS_CHAT_WARMUP_LLM", "").lower() != "true":
+        return
+    config = get_admin_config()
+    if not config.admin_mode:
+        return
+
+    async def prime(model_id: str) -> None:
+        api_key, base_url = config.resolve_credentials(model_id)
+        kwargs = {
+            "model": model_id,
+            "messages": [{"role": "user", "content": "."}],
+            "max_tokens": 1,
+            "timeout": 5,
+        }
+        if api_key:
+            kwargs["api_key"] = api_key
+        if base_url:
+            kwargs["base_url"] = base_url
+        try:
+            await limited_acompletion(**kwargs)
+        except Exception as e:
+            logger.warning(f"Warm-up request to {model_id} failed: {e}")
+
+    await asyncio.gather(*(prime(model.id) for model in config.models))
+
+
+# Provider REST APIs (model lists, Copilot auth) are called on many requests,
+# so they share one pooled client as well
+_provider_http_client: httpx.AsyncClient | None = None
+
+
+def get_provider_http_client() -> httpx.AsyncClient:
+    """Return the shared client for provider APIs, creating it on first use."""
+    global _provider_http_client
+    if _provider_http_client is None or _provider_http_client.is_closed:
+        _provider_http_client = httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(
+                max_connections=100, max_keepalive_connections=20, keepalive_expiry=120
+            ),
+            timeout=httpx.Timeout(10.0),
+        )
+    return _provider_http_client
+
+
+# Redis-backed L2 cache for LLM responses; None unless CANVAS_CHAT_REDIS_URL is set
+_shared_cache: SharedCache | None = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Install shared HTTP clients for the lifetime of the app."""
+    global _shared_cache
+    client = create_llm_http_client()
+    litellm.aclient_session = client
+    _shared_cache = create_shared_cache(os.environ.get("CANVAS_CHAT_REDIS_URL"))
+    # Warm up in the background so startup is not delayed by it
+    warm_up = asyncio.create_task(warm_up_llm())
+    # Discover Ollama models now so the first /api/models call finds them cached
+    ollama_refresh = _start_ollama_refresh()
+    try:
+        yield
+    finally:
+        warm_up.cancel()
+        ollama_refresh.cancel()
+        litellm.aclient_session = None
+        await client.aclose()
+        # Only close clients that were created; never build one just to close it
+        if _local_http_client is not None:
+            await _local_http_client.aclose()
+        if _provider_http_client is not None:
+            await _provider_http_client.aclose()
+        if _shared_cache is not None:
+            await _shared_cache.aclose()
+            _shared_cache = None
+
+
+app = FastAPI(title="Canvas Chat", version=__version__, lifespan=lifespan)
 
 # Register plugin-specific endpoints (must be after app creation)
 git_repo_handler.register_endpoints(app)
 code_handler.register_endpoints(app)
 matrix_handler.register_endpoints(app)
 pptx_endpoints.register_endpoints(app)
+# Bodies parsed with json_body are invisible to FastAPI's schema generation
+document_json_bodies(app)
 
 # --- Configuration Management ---
 # This is initialized at module load time based on environment variables
@@ -168,6 +354,11 @@ def load_python_plugins(config: AppConfig) -> None:
 STATIC_DIR = Path(__file__).parent / "static"
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
+# index.html is static for the lifetime of the process, so read it once
+_INDEX_PATH = STATIC_DIR / "index.html"
+_INDEX_HTML = _INDEX_PATH.read_bytes()
+_INDEX_LAST_MODIFIED = formatdate(_INDEX_PATH.stat().st_mtime, usegmt=True)
+
 
 @app.get("/health")
 async def health_check(request: Request):
@@ -182,9 +373,9 @@ async def health_check(request: Request):
 
     # Check optional Ollama readiness (non-fatal)
     try:
-        async with httpx.AsyncClient(timeout=1.5) as client:
-            resp = await client.get(f"{OLLAMA_BASE_URL}/api/tags")
-            result["ollama"] = resp.status_code == 200
+        client = get_local_http_client()
+        resp = await client.get(f"{OLLAMA_BASE_URL}/api/tags", timeout=1.5)
+        result["ollama"] = resp.status_code == 200
     except Exception:
         result["ollama"] = False
 
@@ -202,10 +393,16 @@ class Message(BaseModel):
     {"type": "image_url", "image_url": {"url": "data:..."}}]
     """
 
+    model_config = ConfigDict(frozen=True)
+
     role: str  # "user", "assistant", "system"
     content: str | list
 
 
+# Serializes a whole message list to LiteLLM dicts in one pydantic-core call
+_MESSAGES_ADAPTER = TypeAdapter(list[Message])
+
+
 class ChatRequest(BaseModel):
     """Request body for chat endpoint."""
 
@@ -226,6 +423,12 @@ class SummarizeRequest(BaseModel):
     base_url: str | None = None
 
 
+class SummaryResponse(BaseModel):
+    """Response body for the summarize and node summary endpoints."""
+
+    summary: str | None
+
+
 class CopilotAuthStartResponse(BaseModel):
     """Response body for starting Copilot device flow."""
 
@@ -261,18 +464,41 @@ class CopilotAuthResponse(BaseModel):
 class ModelInfo(BaseModel):
     """Information about an available model."""
 
+    model_config = ConfigDict(frozen=True)
+
     id: str
     name: str
     provider: str
     context_window: int
 
 
+class FrontendConfigResponse(BaseModel):
+    """Response body for the frontend configuration endpoint."""
+
+    admin_mode: bool = Field(serialization_alias="adminMode")
+    models: list[ModelInfo]
+
+
+class PluginInfo(BaseModel):
+    """A JavaScript plugin the frontend should load."""
+
+    name: str
+    url: str
+    id: str
+
+
+class PluginListResponse(BaseModel):
+    """Response body for listing JavaScript plugins."""
+
+    plugins: list[PluginInfo]
+
+
 class ExaSearchRequest(BaseModel):
     """Request body for Exa search endpoint."""
 
     query: str
     api_key: str
-    num_results: int = 5
+    num_results: int = Field(default=5, ge=1, le=100)  # Exa's per-request limit
     search_type: str = "auto"  # "auto", "neural", "keyword"
 
 
@@ -381,6 +607,13 @@ class CommitteeRequest(BaseModel):
     include_review: bool = False  # Whether to include review/ranking stage
 
 
+# Chat-style bodies carry the DAG history, so parse and validate the raw JSON in
+# one pydantic-core pass rather than json.loads followed by validation
+ChatBody = Annotated[ChatRequest, Depends(json_body(ChatRequest))]
+SummarizeBody = Annotated[SummarizeRequest, Depends(json_body(SummarizeRequest))]
+CommitteeBody = Annotated[CommitteeRequest, Depends(json_body(CommitteeRequest))]
+
+
 # --- Model Registry ---
 
 # Common models with their context windows
@@ -513,21 +746,79 @@ MODEL_REGISTRY: list[dict] = [
     },
 ]
 
+# The registry is static, so validate it once at import instead of per request
+_REGISTRY_MODEL_INFOS: tuple[ModelInfo, ...] = tuple(
+    ModelInfo.model_validate(m) for m in MODEL_REGISTRY
+)
+_MODEL_LIST_ADAPTER = TypeAdapter(list[ModelInfo])
+_REGISTRY_MODELS_JSON: bytes = _MODEL_LIST_ADAPTER.dump_json(
+    list(_REGISTRY_MODEL_INFOS)
+)
 
-def get_api_key_for_provider(provider: str, request_key: str | None) -> str | None:
-    """Get API key from request or fall back to environment."""
-    if request_key:
-        return request_key
-    # LiteLLM will automatically check environment variables
-    return None
+
+# Provider prefixes for registry models, so known IDs skip string parsing
+_PROVIDER_BY_MODEL_ID: dict[str, str] = {
+    m["id"]: m["id"].partition("/")[0] for m in MODEL_REGISTRY
+}
 
 
 def extract_provider(model: str) -> str:
     """Extract provider from model string."""
-    if "/" in model:
-        return model.split("/")[0]
+    provider = _PROVIDER_BY_MODEL_ID.get(model)
+    if provider is not None:
+        return provider
+    prefix, sep, _ = model.partition("/")
     # Default to OpenAI for models without prefix
-    return "openai"
+    return prefix if sep else "openai"
+
+
+async def limited_acompletion(**kwargs: Any) -> Any:
+    """Call litellm.acompletion under the process-wide LLM limits.
+
+    Raises:
+        litellm.RateLimitError: If the request's API key is over its budget or
+            the server has no free LLM slot, so callers handle it like an
+            upstream 429
+    """
+    model = kwargs.get("model", "")
+    if not llm_limiter.check_rate(kwargs.get("api_key")):
+        raise litellm.RateLimitError(
+            message="Too many requests for this API key, please retry shortly",
+            llm_provider=extract_provider(model),
+            model=model,
+        )
+    try:
+        return await llm_limiter.call(litellm.acompletion, **kwargs)
+    except LLMSaturatedError as e:
+        raise litellm.RateLimitError(
+            message=f"Server is busy, please retry shortly ({e})",
+            llm_provider=extract_provider(model),
+            model=model,
+        ) from e
+
+
+# Providers whose LiteLLM integration honors Anthropic-style cache_control blocks
+PROMPT_CACHE_PROVIDERS = frozenset({"anthropic", "bedrock"})
+
+
+def build_system_message(content: str, model: str) -> dict:
+    """Build a system message, marked for prompt caching where supported.
+
+    Static instructions go in the system message so that the provider can
+    reuse the cached prefix across calls whose dynamic content differs.
+    """
+    if extract_provider(model) in PROMPT_CACHE_PROVIDERS:
+        return {
+            "role": "system",
+            "content": [
+                {
+                    "type": "text",
+                    "text": content,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+        }
+    return {"role": "system", "content": content}
 
 
 GITHUB_COPILOT_API_BASE = os.getenv(
@@ -542,24 +833,28 @@ GITHUB_COPILOT_PLUGIN_VERSION = "copilot/1.155.0"
 GITHUB_COPILOT_USER_AGENT = "GithubCopilot/1.155.0"
 
 
+# Copilot request headers that are the same for every call; only x-request-id
+# varies, so it is added per request
+COPILOT_STATIC_HEADERS: dict[str, str] = {
+    "editor-version": GITHUB_COPILOT_EDITOR_VERSION,
+    "editor-plugin-version": GITHUB_COPILOT_PLUGIN_VERSION,
+    "user-agent": GITHUB_COPILOT_USER_AGENT,
+    "copilot-integration-id": "vscode-chat",
+    "openai-intent": "conversation-panel",
+    "x-github-api-version": "2025-04-01",
+    "x-vscode-user-agent-library-version": "electron-fetch",
+    "x-initiator": "user",
+}
+
+
 def get_copilot_headers(model: str) -> dict:
     """Return extra headers needed for GitHub Copilot models.
 
     GitHub Copilot API requires specific headers for IDE authentication.
     See: https://docs.litellm.ai/docs/providers/github_copilot
     """
-    if model.startswith("github_copilot/"):
-        return {
-            "editor-version": GITHUB_COPILOT_EDITOR_VERSION,
-            "editor-plugin-version": GITHUB_COPILOT_PLUGIN_VERSION,
-            "user-agent": GITHUB_COPILOT_USER_AGENT,
-            "copilot-integration-id": "vscode-chat",
-            "openai-intent": "conversation-panel",
-            "x-github-api-version": "2025-04-01",
-            "x-request-id": str(uuid4()),
-            "x-vscode-user-agent-library-version": "electron-fetch",
-            "x-initiator": "user",
-        }
+    if is_copilot_model(model):
+        return {**COPILOT_STATIC_HEADERS, "x-request-id": str(uuid4())}
     return {}
 
 
@@ -567,7 +862,10 @@ def add_copilot_headers(kwargs: dict, model: str) -> dict:
     """Add GitHub Copilot headers if needed."""
     copilot_headers = get_copilot_headers(model)
     if copilot_headers:
-        kwargs["extra_headers"] = {**kwargs.get("extra_headers", {}), **copilot_headers}
+        extra_headers = kwargs.get("extra_headers")
+        if extra_headers:
+            copilot_headers = {**extra_headers, **copilot_headers}
+        kwargs["extra_headers"] = copilot_headers
     return kwargs
 
 
@@ -616,33 +914,39 @@ def prepare_copilot_openai_request(
     return kwargs
 
 
+# Device flow + token exchange headers; only the authorization header varies
+COPILOT_AUTH_HEADERS: dict[str, str] = {
+    "accept": "application/json",
+    "editor-version": GITHUB_COPILOT_EDITOR_VERSION,
+    "editor-plugin-version": GITHUB_COPILOT_PLUGIN_VERSION,
+    "user-agent": GITHUB_COPILOT_USER_AGENT,
+    "content-type": "application/json",
+}
+
+
 def get_copilot_auth_headers(access_token: str | None = None) -> dict:
-    """Headers for GitHub Copilot device flow + token exchange."""
-    headers = {
-        "accept": "application/json",
-        "editor-version": GITHUB_COPILOT_EDITOR_VERSION,
-        "editor-plugin-version": GITHUB_COPILOT_PLUGIN_VERSION,
-        "user-agent": GITHUB_COPILOT_USER_AGENT,
-        "content-type": "application/json",
-    }
+    """Headers for GitHub Copilot device flow + token exchange.
+
+    Without a token the shared constant is returned as-is; treat it as read-only.
+    """
     if access_token:
-        headers["authorization"] = f"token {access_token}"
-    return headers
+        return {**COPILOT_AUTH_HEADERS, "authorization": f"token {access_token}"}
+    return COPILOT_AUTH_HEADERS
 
 
 async def request_copilot_device_code() -> dict[str, Any]:
     """Request a GitHub Copilot device code."""
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        response = await client.post(
-            GITHUB_COPILOT_DEVICE_CODE_URL,
-            headers=get_copilot_auth_headers(),
-            json={"client_id": GITHUB_COPILOT_CLIENT_ID, "scope": "read:user"},
-        )
-        response.raise_for_status()
-        data = response.json()
-        if not data.get("device_code") or not data.get("user_code"):
-            raise HTTPException(status_code=400, detail="Invalid device code response")
-        return data
+    client = get_provider_http_client()
+    response = await client.post(
+        GITHUB_COPILOT_DEVICE_CODE_URL,
+        headers=get_copilot_auth_headers(),
+        json={"client_id": GITHUB_COPILOT_CLIENT_ID, "scope": "read:user"},
+    )
+    response.raise_for_status()
+    data = response.json()
+    if not data.get("device_code") or not data.get("user_code"):
+        raise HTTPException(status_code=400, detail="Invalid device code response")
+    return data
 
 
 async def poll_copilot_access_token(
@@ -651,30 +955,30 @@ async def poll_copilot_access_token(
     """Poll for Copilot access token after device auth."""
     deadline = time.monotonic() + expires_in
     poll_interval = max(interval, 1)
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        while time.monotonic() < deadline:
-            response = await client.post(
-                GITHUB_COPILOT_ACCESS_TOKEN_URL,
-                headers=get_copilot_auth_headers(),
-                json={
-                    "client_id": GITHUB_COPILOT_CLIENT_ID,
-                    "device_code": device_code,
-                    "grant_type": "urn:ietf:params:oauth:grant-type:device_code",
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
-            if data.get("access_token"):
-                return data["access_token"]
-            error = data.get("error")
-            if error == "authorization_pending":
-                await asyncio.sleep(poll_interval)
-                continue
-            if error == "slow_down":
-                poll_interval += 5
-                await asyncio.sleep(poll_interval)
-                continue
-            raise HTTPException(status_code=400, detail=f"Copilot auth failed: {error}")
+    client = get_provider_http_client()
+    while time.monotonic() < deadline:
+        response = await client.post(
+            GITHUB_COPILOT_ACCESS_TOKEN_URL,
+            headers=get_copilot_auth_headers(),
+            json={
+                "client_id": GITHUB_COPILOT_CLIENT_ID,
+                "device_code": device_code,
+                "grant_type": "urn:ietf:params:oauth:grant-type:device_code",
+            },
+        )
+        response.raise_for_status()
+        data = response.json()
+        if data.get("access_token"):
+            return data["access_token"]
+        error = data.get("error")
+        if error == "authorization_pending":
+            await asyncio.sleep(poll_interval)
+            continue
+        if error == "slow_down":
+            poll_interval += 5
+            await asyncio.sleep(poll_interval)
+            continue
+        raise HTTPException(status_code=400, detail=f"Copilot auth failed: {error}")
     raise HTTPException(
         status_code=400, detail="Timed out waiting for Copilot authentication"
     )
@@ -682,45 +986,98 @@ async def poll_copilot_access_token(
 
 async def fetch_copilot_api_key(access_token: str) -> dict[str, Any]:
     """Exchange GitHub access token for Copilot API key."""
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        response = await client.get(
-            GITHUB_COPILOT_API_KEY_URL,
-            headers=get_copilot_auth_headers(access_token),
+    client = get_provider_http_client()
+    response = await client.get(
+        GITHUB_COPILOT_API_KEY_URL,
+        headers=get_copilot_auth_headers(access_token),
+    )
+    response.raise_for_status()
+    data = response.json()
+    token = data.get("token")
+    if not token:
+        raise HTTPException(
+            status_code=400, detail="Copilot token response missing API key"
         )
-        response.raise_for_status()
-        data = response.json()
-        token = data.get("token")
-        if not token:
-            raise HTTPException(
-                status_code=400, detail="Copilot token response missing API key"
-            )
-        return data
+    return data
 
 
 OLLAMA_BASE_URL = "http://localhost:11434"
 
 
+# Installed Ollama models change rarely, so /api/models polls Ollama at most
+# every 30 seconds. Once a list is known, expired entries are served stale while
+# a single background task refreshes them, so requests never wait on Ollama.
+_ollama_models_cache = TTLCache(maxsize=1, ttl=30)
+_ollama_models_stale: list[dict] | None = None
+_ollama_refresh_task: asyncio.Task | None = None
+
+# How long the very first lookup waits before answering without Ollama models
+OLLAMA_FIRST_FETCH_TIMEOUT = 1.0
+
+
+async def _refresh_ollama_models() -> list[dict]:
+    """Fetch Ollama models and store them as both fresh and last-known."""
+    global _ollama_models_stale
+    models = await request_ollama_models()
+    _ollama_models_cache.set(OLLAMA_BASE_URL, models)
+    _ollama_models_stale = models
+    return models
+
+
+def _start_ollama_refresh() -> asyncio.Task:
+    """Return the in-flight refresh task, starting one if none is running."""
+    global _ollama_refresh_task
+    task = _ollama_refresh_task
+    if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.create_task(_refresh_ollama_models())
+        _ollama_refresh_task = task
+    return task
+
+
 async def fetch_ollama_models() -> list[dict]:
-    """Fetch available models from local Ollama instance."""
+    """Fetch available models from local Ollama instance, cached briefly.
+
+    An unreachable Ollama is cached too (as an empty list), so the endpoint
+    does not wait on a connection attempt for every request.
+    """
+    models = _ollama_models_cache.get(OLLAMA_BASE_URL)
+    if models is not None:
+        return models
+
+    task = _start_ollama_refresh()
+    if _ollama_models_stale is not None:
+        return _ollama_models_stale
+
+    # Nothing known yet: wait briefly, leaving the refresh running on timeout
     try:
-        async with httpx.AsyncClient(timeout=2.0) as client:
-            response = await client.get(f"{OLLAMA_BASE_URL}/api/tags")
-            if response.status_code == 200:
-                data = response.json()
-                models = []
-                for model in data.get("models", []):
-                    name = model.get("name", "")
-                    # Clean up model name for display (remove :latest suffix)
-                    display_name = name.replace(":latest", "")
-                    models.append(
-                        {
-                            "id": f"ollama_chat/{name}",
-                            "name": display_name,
-                            "provider": "Ollama",
-                            "context_window": 128000,  # Default, varies by model
-                        }
-                    )
-                return models
+        return await asyncio.wait_for(
+            asyncio.shield(task), timeout=OLLAMA_FIRST_FETCH_TIMEOUT
+        )
+    except TimeoutError:
+        return []
+
+
+async def request_ollama_models() -> list[dict]:
+    """Request the installed models from the local Ollama instance."""
+    try:
+        client = get_local_http_client()
+        response = await client.get(f"{OLLAMA_BASE_URL}/api/tags")
+        if response.status_code == 200:
+            data = response.json()
+            models = []
+            for model in data.get("models", []):
+                name = model.get("name", "")
+                # Clean up model name for display (remove :latest suffix)
+                display_name = name.replace(":latest", "")
+                models.append(
+                    {
+                        "id": f"ollama_chat/{name}",
+                        "name": display_name,
+                        "provider": "Ollama",
+                        "context_window": 128000,  # Default, varies by model
+                    }
+                )
+            return models
     except (httpx.RequestError, httpx.TimeoutException):
         # Ollama not running or not accessible
         pass
@@ -752,8 +1109,13 @@ KNOWN_CONTEXT_WINDOWS = {
 }
 
 
+# Provider model lists repeat the same IDs on every fetch, so remember answers
+@lru_cache(maxsize=4096)
 def get_context_window(model_id: str) -> int:
-    """Estimate context window for a model based on known patterns."""
+    """Estimate context window for a model based on known patterns.
+
+    The first pattern in KNOWN_CONTEXT_WINDOWS found in the ID wins.
+    """
     model_lower = model_id.lower()
     for pattern, ctx in KNOWN_CONTEXT_WINDOWS.items():
         if pattern in model_lower:
@@ -761,66 +1123,71 @@ def get_context_window(model_id: str) -> int:
     return 128000  # Default
 
 
+# Substrings marking chat-capable models
+CHAT_MODEL_PATTERNS = (
+    "gpt-3.5",
+    "gpt-4",
+    "gpt-oss",
+    "chatgpt",
+    "claude",
+    "gemini",
+    "llama",
+    "mixtral",
+    "deepseek",
+    "qwen",
+    "compound",  # Groq compound models
+)
+# Substrings marking non-chat models, which win over CHAT_MODEL_PATTERNS
+NON_CHAT_MODEL_PATTERNS = (
+    "whisper",
+    "tts",
+    "dall-e",
+    "embedding",
+    "moderation",
+    "guard",  # Safety/guard models
+    "safeguard",
+    "realtime",  # Realtime API models
+    "audio",  # Audio models
+    "turbo-instruct",  # Legacy instruct models (not chat)
+    "image",  # Image generation models
+)
+# Provider model lists can hold hundreds of IDs, so match each pattern set in
+# one regex scan instead of one substring test per pattern
+_CHAT_MODEL_RE = re.compile("|".join(map(re.escape, CHAT_MODEL_PATTERNS)))
+_NON_CHAT_MODEL_RE = re.compile("|".join(map(re.escape, NON_CHAT_MODEL_PATTERNS)))
+
+
 def is_chat_model(model_id: str) -> bool:
     """Filter for models that support chat completions."""
     model_lower = model_id.lower()
-    # Include chat-capable models
-    chat_patterns = [
-        "gpt-3.5",
-        "gpt-4",
-        "gpt-oss",
-        "chatgpt",
-        "claude",
-        "gemini",
-        "llama",
-        "mixtral",
-        "deepseek",
-        "qwen",
-        "compound",  # Groq compound models
-    ]
-    # Exclude non-chat models
-    exclude_patterns = [
-        "whisper",
-        "tts",
-        "dall-e",
-        "embedding",
-        "moderation",
-        "guard",  # Safety/guard models
-        "safeguard",
-        "realtime",  # Realtime API models
-        "audio",  # Audio models
-        "turbo-instruct",  # Legacy instruct models (not chat)
-        "image",  # Image generation models
-    ]
-
-    if any(exc in model_lower for exc in exclude_patterns):
+    if _NON_CHAT_MODEL_RE.search(model_lower):
         return False
-    return any(pat in model_lower for pat in chat_patterns)
+    return _CHAT_MODEL_RE.search(model_lower) is not None
 
 
 async def fetch_openai_models(api_key: str) -> list[dict]:
     """Fetch available models from OpenAI."""
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                PROVIDER_ENDPOINTS["openai"],
-                headers={"Authorization": f"Bearer {api_key}"},
-            )
-            if response.status_code == 200:
-                data = response.json()
-                models = []
-                for m in data.get("data", []):
-                    model_id = m.get("id", "")
-                    if is_chat_model(model_id):
-                        models.append(
-                            {
-                                "id": f"openai/{model_id}",
-                                "name": model_id,
-                                "provider": "OpenAI",
-                                "context_window": get_context_window(model_id),
-                            }
-                        )
-                return models
+        client = get_provider_http_client()
+        response = await client.get(
+            PROVIDER_ENDPOINTS["openai"],
+            headers={"Authorization": f"Bearer {api_key}"},
+        )
+        if response.status_code == 200:
+            data = response.json()
+            models = []
+            for m in data.get("data", []):
+                model_id = m.get("id", "")
+                if is_chat_model(model_id):
+                    models.append(
+                        {
+                            "id": f"openai/{model_id}",
+                            "name": model_id,
+                            "provider": "OpenAI",
+                            "context_window": get_context_window(model_id),
+                        }
+                    )
+            return models
     except (httpx.RequestError, httpx.TimeoutException) as e:
         logger.warning(f"Failed to fetch OpenAI models: {e}")
     return []
@@ -829,30 +1196,30 @@ async def fetch_openai_models(api_key: str) -> list[dict]:
 async def fetch_groq_models(api_key: str) -> list[dict]:
     """Fetch available models from Groq."""
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                PROVIDER_ENDPOINTS["groq"],
-                headers={"Authorization": f"Bearer {api_key}"},
-            )
-            if response.status_code == 200:
-                data = response.json()
-                models = []
-                for m in data.get("data", []):
-                    model_id = m.get("id", "")
-                    # Filter out non-chat models (TTS, whisper, guard, etc.)
-                    if not is_chat_model(model_id):
-                        continue
-                    models.append(
-                        {
-                            "id": f"groq/{model_id}",
-                            "name": model_id,
-                            "provider": "Groq",
-                            "context_window": m.get(
-                                "context_window", get_context_window(model_id)
-                            ),
-                        }
-                    )
-                return models
+        client = get_provider_http_client()
+        response = await client.get(
+            PROVIDER_ENDPOINTS["groq"],
+            headers={"Authorization": f"Bearer {api_key}"},
+        )
+        if response.status_code == 200:
+            data = response.json()
+            models = []
+            for m in data.get("data", []):
+                model_id = m.get("id", "")
+                # Filter out non-chat models (TTS, whisper, guard, etc.)
+                if not is_chat_model(model_id):
+                    continue
+                models.append(
+                    {
+                        "id": f"groq/{model_id}",
+                        "name": model_id,
+                        "provider": "Groq",
+                        "context_window": m.get(
+                            "context_window", get_context_window(model_id)
+                        ),
+                    }
+                )
+            return models
     except (httpx.RequestError, httpx.TimeoutException) as e:
         logger.warning(f"Failed to fetch Groq models: {e}")
     return []
@@ -861,26 +1228,26 @@ async def fetch_groq_models(api_key: str) -> list[dict]:
 async def fetch_github_models(api_key: str) -> list[dict]:
     """Fetch available models from GitHub Models."""
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                PROVIDER_ENDPOINTS["github"],
-                headers={"Authorization": f"Bearer {api_key}"},
-            )
-            if response.status_code == 200:
-                data = response.json()
-                models = []
-                for m in data if isinstance(data, list) else data.get("data", []):
-                    model_id = m.get("id", "") or m.get("name", "")
-                    if model_id:
-                        models.append(
-                            {
-                                "id": f"github/{model_id}",
-                                "name": model_id,
-                                "provider": "GitHub",
-                                "context_window": get_context_window(model_id),
-                            }
-                        )
-                return models
+        client = get_provider_http_client()
+        response = await client.get(
+            PROVIDER_ENDPOINTS["github"],
+            headers={"Authorization": f"Bearer {api_key}"},
+        )
+        if response.status_code == 200:
+            data = response.json()
+            models = []
+            for m in data if isinstance(data, list) else data.get("data", []):
+                model_id = m.get("id", "") or m.get("name", "")
+                if model_id:
+                    models.append(
+                        {
+                            "id": f"github/{model_id}",
+                            "name": model_id,
+                            "provider": "GitHub",
+                            "context_window": get_context_window(model_id),
+                        }
+                    )
+            return models
     except (httpx.RequestError, httpx.TimeoutException) as e:
         logger.warning(f"Failed to fetch GitHub models: {e}")
     return []
@@ -907,29 +1274,29 @@ async def fetch_github_copilot_models() -> list[dict]:
 async def fetch_google_models(api_key: str) -> list[dict]:
     """Fetch available models from Google AI."""
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"https://generativelanguage.googleapis.com/v1/models?key={api_key}",
-            )
-            if response.status_code == 200:
-                data = response.json()
-                models = []
-                for m in data.get("models", []):
-                    # Model name format: "models/gemini-1.5-pro"
-                    full_name = m.get("name", "")
-                    model_id = full_name.replace("models/", "")
-                    display_name = m.get("displayName", model_id)
-                    # Only include generative models
-                    if "generateContent" in m.get("supportedGenerationMethods", []):
-                        models.append(
-                            {
-                                "id": f"gemini/{model_id}",
-                                "name": display_name,
-                                "provider": "Google",
-                                "context_window": m.get("inputTokenLimit", 1000000),
-                            }
-                        )
-                return models
+        client = get_provider_http_client()
+        response = await client.get(
+            f"https://generativelanguage.googleapis.com/v1/models?key={api_key}",
+        )
+        if response.status_code == 200:
+            data = response.json()
+            models = []
+            for m in data.get("models", []):
+                # Model name format: "models/gemini-1.5-pro"
+                full_name = m.get("name", "")
+                model_id = full_name.replace("models/", "")
+                display_name = m.get("displayName", model_id)
+                # Only include generative models
+                if "generateContent" in m.get("supportedGenerationMethods", []):
+                    models.append(
+                        {
+                            "id": f"gemini/{model_id}",
+                            "name": display_name,
+                            "provider": "Google",
+                            "context_window": m.get("inputTokenLimit", 1000000),
+                        }
+                    )
+            return models
     except (httpx.RequestError, httpx.TimeoutException) as e:
         logger.warning(f"Failed to fetch Google models: {e}")
     return []
@@ -988,6 +1355,12 @@ ANTHROPIC_MODELS = [
 ]
 
 
+# Validated and encoded once, like the model registry
+_ANTHROPIC_MODELS_JSON: bytes = _MODEL_LIST_ADAPTER.dump_json(
+    _MODEL_LIST_ADAPTER.validate_python(ANTHROPIC_MODELS)
+)
+
+
 async def fetch_anthropic_models(api_key: str) -> list[dict]:
     """Return static Anthropic models (no list API available)."""
     # Verify the API key is valid by checking format
@@ -999,36 +1372,71 @@ async def fetch_anthropic_models(api_key: str) -> list[dict]:
 # --- Routes ---
 
 
-@app.get("/", response_class=HTMLResponse)
-async def root():
-    """Serve the main application."""
-    index_path = STATIC_DIR / "index.html"
-    html = index_path.read_text()
+@lru_cache(maxsize=8)
+def render_index_html(plugin_urls: tuple[str, ...]) -> tuple[bytes, str]:
+    """Render index.html with plugin script tags injected.
 
-    # Inject plugin script tags if plugins are configured
-    config = get_admin_config()
-    if config.plugins:
-        plugin_scripts = []
-        for plugin in config.plugins:
-            # Only inject JS plugins (Python plugins are loaded on backend)
-            if plugin.js_path:
-                plugin_url = f"/api/plugins/{plugin.js_path.name}"
-                plugin_scripts.append(
-                    f'        <script type="module" src="{plugin_url}"></script>'
-                )
+    Args:
+        plugin_urls: URLs of the JS plugins to load, in config order
 
+    Returns:
+        Tuple of (encoded HTML body, ETag header value)
+    """
+    body = _INDEX_HTML
+    if plugin_urls:
+        plugin_html = "\n".join(
+            f'        <script type="module" src="{url}"></script>'
+            for url in plugin_urls
+        )
         # Inject before the closing </body> tag
-        if plugin_scripts:
-            plugin_html = "\n".join(plugin_scripts)
-            html = html.replace(
-                "</body>",
-                f"\n        <!-- Custom plugins -->\n{plugin_html}\n    </body>",
-            )
+        html = body.decode("utf-8").replace(
+            "</body>",
+            f"\n        <!-- Custom plugins -->\n{plugin_html}\n    </body>",
+        )
+        body = html.encode("utf-8")
+    etag = f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'
+    return body, etag
 
-    return HTMLResponse(content=html)
 
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against etag.
 
-@app.get("/api/config")
+    Handles ``*``, comma-separated lists and weak (``W/``) validators, using
+    the weak comparison RFC 9110 requires for If-None-Match.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == target for tag in if_none_match.split(",")
+    )
+
+
+@app.get("/", response_class=HTMLResponse)
+async def root(request: Request):
+    """Serve the main application."""
+    # Only inject JS plugins (Python plugins are loaded on backend)
+    config = get_admin_config()
+    plugin_urls = tuple(
+        f"/api/plugins/{plugin.js_path.name}"
+        for plugin in config.plugins
+        if plugin.js_path
+    )
+    body, etag = render_index_html(plugin_urls)
+
+    headers = {
+        "ETag": etag,
+        "Last-Modified": _INDEX_LAST_MODIFIED,
+        "Cache-Control": "public, max-age=60",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="text/html", headers=headers)
+
+
+@app.get("/api/config", response_model=FrontendConfigResponse)
 async def get_config():
     """Get application configuration for the frontend.
 
@@ -1038,12 +1446,12 @@ async def get_config():
     """
     config = get_admin_config()
     return {
-        "adminMode": config.admin_mode,
+        "admin_mode": config.admin_mode,
         "models": config.get_frontend_models() if config.admin_mode else [],
     }
 
 
-@app.get("/api/plugins")
+@app.get("/api/plugins", response_model=PluginListResponse)
 async def list_plugins():
     """List available plugin files.
 
@@ -1187,8 +1595,9 @@ def inject_admin_credentials_committee(request: CommitteeRequest) -> CommitteeRe
     if not config.admin_mode:
         return request
 
-    # Collect all models that need credentials
-    all_models = list(request.models) + [request.chairman_model]
+    # Collect all models that need credentials; the chairman is often also a
+    # member, so dedupe to resolve each model's credentials once
+    all_models = list(dict.fromkeys([*request.models, request.chairman_model]))
 
     if any(is_copilot_model(model_id) for model_id in all_models):
         raise HTTPException(
@@ -1222,21 +1631,52 @@ def inject_admin_credentials_committee(request: CommitteeRequest) -> CommitteeRe
     return request
 
 
-@app.get("/api/models")
-async def list_models() -> list[ModelInfo]:
+@app.get("/api/models", response_model=list[ModelInfo])
+async def list_models() -> Response:
     """List available models, including dynamically fetched Ollama models."""
-    # Start with static registry models
-    models = [ModelInfo(**m) for m in MODEL_REGISTRY]
-
     # Fetch Ollama models dynamically
     ollama_models = await fetch_ollama_models()
-    models.extend([ModelInfo(**m) for m in ollama_models])
+    if not ollama_models:
+        # Static registry only: serve the JSON encoded once at import
+        return Response(content=_REGISTRY_MODELS_JSON, media_type="application/json")
 
-    return models
+    return Response(
+        content=_merged_models_json(ollama_models), media_type="application/json"
+    )
+
+
+# Last Ollama list seen by /api/models and the response body built from it
+_merged_models_body: tuple[list[dict], bytes] | None = None
+
+
+def _merged_models_json(ollama_models: list[dict]) -> bytes:
+    """Return the registry plus Ollama models as JSON, encoded once per list.
+
+    fetch_ollama_models hands back the same list object until the next
+    refresh, so the body is only rebuilt when Ollama's models are re-fetched.
+    """
+    global _merged_models_body
+    cached = _merged_models_body
+    if cached is not None and cached[0] is ollama_models:
+        return cached[1]
+
+    # Ollama entries are built by fetch_ollama_models, so skip re-validation, and
+    # splice their JSON onto the pre-encoded registry array instead of
+    # re-encoding the registry: '[r1,r2]' + '[o1]' -> '[r1,r2,o1]'
+    ollama_json = _MODEL_LIST_ADAPTER.dump_json(
+        [ModelInfo.model_construct(**m) for m in ollama_models]
+    )
+    body = b"".join((_REGISTRY_MODELS_JSON[:-1], b",", ollama_json[1:]))
+    _merged_models_body = (ollama_models, body)
+    return body
+
+
+PROVIDER_MODELS_CACHE_TTL = 300
+_provider_models_cache = TTLCache(maxsize=64, ttl=PROVIDER_MODELS_CACHE_TTL)
 
 
-@app.post("/api/provider-models")
-async def get_provider_models(request: ProviderModelsRequest) -> list[ModelInfo]:
+@app.post("/api/provider-models", response_model=list[ModelInfo])
+async def get_provider_models(request: ProviderModelsRequest) -> Response:
     """Fetch available models from a specific provider using the provided API key."""
     provider = request.provider.lower()
     api_key = request.api_key
@@ -1246,12 +1686,23 @@ async def get_provider_models(request: ProviderModelsRequest) -> list[ModelInfo]
     elif not api_key:
         raise HTTPException(status_code=400, detail="API key is required")
 
+    # Model lists change rarely, so reuse each key's list for a few minutes.
+    # Keys are hashed so the cache does not hold raw API keys.
+    cache_key = (provider, api_key_digest(api_key))
+    cached_body = _provider_models_cache.get(cache_key)
+    if cached_body is not None:
+        return Response(content=cached_body, media_type="application/json")
+
     models: list[dict] = []
 
     if provider == "openai":
         models = await fetch_openai_models(api_key)
     elif provider == "anthropic":
-        models = await fetch_anthropic_models(api_key)
+        # The list is static, so serve the JSON encoded at import
+        if await fetch_anthropic_models(api_key):
+            return Response(
+                content=_ANTHROPIC_MODELS_JSON, media_type="application/json"
+            )
     elif provider == "google":
         models = await fetch_google_models(api_key)
     elif provider == "groq":
@@ -1263,11 +1714,146 @@ async def get_provider_models(request: ProviderModelsRequest) -> list[ModelInfo]
     else:
         raise HTTPException(status_code=400, detail=f"Unknown provider: {provider}")
 
-    return [ModelInfo(**m) for m in models]
+    # Validate once and encode straight to JSON bytes in pydantic-core, instead
+    # of FastAPI's validate -> to-python -> json.dumps response path
+    body = _MODEL_LIST_ADAPTER.dump_json(_MODEL_LIST_ADAPTER.validate_python(models))
+    # Fetchers return [] on errors; do not cache those
+    if models:
+        _provider_models_cache.set(cache_key, body)
+    return Response(content=body, media_type="application/json")
+
+
+async def iter_content_deltas(response: AsyncIterable[Any]) -> AsyncIterator[str]:
+    """Yield the non-empty text deltas from a LiteLLM streaming response.
+
+    The response is closed when iteration ends, fails or is abandoned, which
+    frees its LLM concurrency slot.
+    """
+    try:
+        async for chunk in response:
+            choices = chunk.choices
+            if not choices:
+                continue
+            # Some providers send usage/heartbeat frames with no delta at all
+            delta = choices[0].delta
+            content = delta.content if delta is not None else None
+            if content:
+                yield content
+    finally:
+        aclose = getattr(response, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+# Same line-break rule sse_starlette uses to split data across "data:" lines
+_SSE_LINE_BREAKS = re.compile(r"\r\n|\r|\n")
+
+
+def encode_message_event(content: str) -> bytes:
+    """Encode a text chunk as an SSE ``message`` event.
+
+    Produces the same bytes as ``ServerSentEvent(data=content,
+    event="message").encode()`` without building an event object per chunk;
+    EventSourceResponse passes bytes through unchanged.
+    """
+    data = "\r\ndata: ".join(_SSE_LINE_BREAKS.split(content))
+    return f"event: message\r\ndata: {data}\r\n\r\n".encode()
+
+
+# Marks the end of the upstream stream in coalesce_deltas' queue
+_END_OF_DELTAS = object()
+
+
+async def coalesce_deltas(
+    deltas: AsyncIterable[str],
+    interval: float = 0.025,
+    max_parts: int = 16,
+    max_chars: int = 8192,
+) -> AsyncIterator[str]:
+    """Merge streamed text deltas into fewer, larger chunks.
+
+    The first delta is passed through immediately to keep time-to-first-token
+    low. After that, deltas arriving within ``interval`` seconds of each other
+    are joined, so each SSE event carries several tokens instead of one.
+    Buffered text is flushed once the window elapses even if the upstream
+    stream stalls.
+
+    Args:
+        deltas: Async iterable of text fragments (e.g. LLM stream deltas)
+        interval: Maximum seconds a fragment may wait in the buffer
+        max_parts: Flush early once this many fragments are buffered
+        max_chars: Flush early once the buffered text reaches this length
+
+    Yields:
+        Concatenated text chunks, in order
+    """
+    loop = asyncio.get_running_loop()
+    # One reader task drains the upstream stream into a queue, so waiting for
+    # the next delta with a timeout does not need a new task per token
+    queue: asyncio.Queue = asyncio.Queue()
+    error: BaseException | None = None
+
+    async def read_deltas() -> None:
+        nonlocal error
+        try:
+            async for delta in deltas:
+                queue.put_nowait(delta)
+        except Exception as e:
+            error = e
+        finally:
+            queue.put_nowait(_END_OF_DELTAS)
+
+    reader = asyncio.create_task(read_deltas())
+    buffer: list[str] = []
+    buffered_chars = 0
+    deadline = 0.0
+    first = True
+    try:
+        while True:
+            if not buffer:
+                delta = await queue.get()
+            elif not queue.empty():
+                delta = queue.get_nowait()
+            else:
+                try:
+                    async with asyncio.timeout(max(deadline - loop.time(), 0.0)):
+                        delta = await queue.get()
+                except TimeoutError:
+                    # Upstream stalled: flush what has been buffered so far
+                    yield "".join(buffer)
+                    buffer.clear()
+                    buffered_chars = 0
+                    continue
+
+            if delta is _END_OF_DELTAS:
+                break
+            if first:
+                first = False
+                yield delta
+                continue
+            if not buffer:
+                deadline = loop.time() + interval
+            buffer.append(delta)
+            buffered_chars += len(delta)
+            if (
+                len(buffer) >= max_parts
+                or buffered_chars >= max_chars
+                or loop.time() >= deadline
+            ):
+                yield "".join(buffer)
+                buffer.clear()
+                buffered_chars = 0
+
+        if error is not None:
+            raise error
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        reader.cancel()
 
 
 @app.post("/api/chat")
-async def chat(request: ChatRequest, http_request: Request):
+async def chat(request: ChatBody, http_request: Request):
     """
     Stream a chat completion response.
 
@@ -1280,7 +1866,7 @@ async def chat(request: ChatRequest, http_request: Request):
     # Build kwargs for litellm
     kwargs = {
         "model": request.model,
-        "messages": [{"role": m.role, "content": m.content} for m in request.messages],
+        "messages": _MESSAGES_ADAPTER.dump_python(request.messages),
         "temperature": request.temperature,
         "stream": True,
     }
@@ -1301,12 +1887,11 @@ async def chat(request: ChatRequest, http_request: Request):
     async def generate():
         """Generate SSE events from the LLM stream."""
         try:
-            response = await litellm.acompletion(**kwargs)
+            response = await limited_acompletion(**kwargs)
 
-            async for chunk in response:
-                if chunk.choices and chunk.choices[0].delta.content:
-                    content = chunk.choices[0].delta.content
-                    yield {"event": "message", "data": content}
+            # Coalesce tokens so each SSE event carries several of them
+            async for content in coalesce_deltas(iter_content_deltas(response)):
+                yield encode_message_event(content)
 
             # Send completion signal
             yield {"event": "done", "data": ""}
@@ -1357,8 +1942,22 @@ async def chat(request: ChatRequest, http_request: Request):
     return EventSourceResponse(generate())
 
 
-@app.post("/api/summarize")
-async def summarize(request: SummarizeRequest):
+SUMMARIZE_SYSTEM_PROMPT = """Please provide a concise summary of the following \
+conversation.
+Focus on the key points, decisions, and insights discussed."""
+
+# Summaries are deterministic enough at low temperature to reuse for identical
+# branches (e.g. re-summarizing after a canvas re-layout)
+_summary_cache = TTLCache(maxsize=1024, ttl=3600)
+# How long summaries stay in the shared Redis cache, when configured
+SHARED_SUMMARY_TTL = 4 * 3600
+
+# Multimodal content (a list of parts) formats the same as str(content)
+_format_summary_line = "{0.role}: {0.content}\n".format
+
+
+@app.post("/api/summarize", response_model=SummaryResponse)
+async def summarize(request: SummarizeBody):
     """
     Generate a summary of a conversation branch.
 
@@ -1367,20 +1966,18 @@ async def summarize(request: SummarizeRequest):
     # Inject admin credentials if in admin mode
     inject_admin_credentials(request)
 
-    # Build the summarization prompt
-    conversation = "\n".join([f"{m.role}: {m.content}" for m in request.messages])
-
-    summary_prompt = f"""Please provide a concise summary of the following conversation.
-Focus on the key points, decisions, and insights discussed.
-
-Conversation:
-{conversation}
-
-Summary:"""
+    # Build the summarization prompt in one join rather than per-message
+    # f-strings plus a second copy for the template. Static instructions live in
+    # the system message, so the instruction prefix can hit the prompt cache.
+    conversation = "".join(map(_format_summary_line, request.messages))
+    summary_prompt = f"Conversation:\n{conversation}\nSummary:"
 
     kwargs = {
         "model": request.model,
-        "messages": [{"role": "user", "content": summary_prompt}],
+        "messages": [
+            build_system_message(SUMMARIZE_SYSTEM_PROMPT, request.model),
+            {"role": "user", "content": summary_prompt},
+        ],
         "temperature": 0.3,  # Lower temperature for more consistent summaries
         "max_tokens": 500,
     }
@@ -1393,10 +1990,41 @@ Summary:"""
 
     kwargs = prepare_copilot_openai_request(kwargs, request.model, request.api_key)
 
+    cache_key = make_cache_key(
+        {
+            "model": request.model,
+            "base_url": request.base_url,
+            "api_key": api_key_digest(request.api_key),
+            "messages": kwargs["messages"],
+            "temperature": kwargs["temperature"],
+            "max_tokens": kwargs["max_tokens"],
+        }
+    )
+    cached_summary = _summary_cache.get(cache_key)
+    if cached_summary is not None:
+        return {"summary": cached_summary}
+    shared_cache = _shared_cache
+    if shared_cache is not None:
+        cached_summary = await shared_cache.get(f"summary:{cache_key}")
+        if cached_summary is not None:
+            _summary_cache.set(cache_key, cached_summary)
+            return {"summary": cached_summary}
+
     try:
-        response = await litellm.acompletion(**kwargs)
+        response = await limited_acompletion(**kwargs)
         summary = response.choices[0].message.content
+        if summary:
+            _summary_cache.set(cache_key, summary)
+            if shared_cache is not None:
+                await shared_cache.set(
+                    f"summary:{cache_key}", summary, ttl=SHARED_SUMMARY_TTL
+                )
         return {"summary": summary}
+    except litellm.RateLimitError as e:
+        raise HTTPException(
+            status_code=429,
+            detail="Rate limit exceeded. Please try again later.",
+        ) from e
     except Exception as e:
         error_msg = str(e)
         if request.model.startswith("github_copilot/") and (
@@ -1473,6 +2101,34 @@ async def refresh_copilot_auth(request: CopilotAuthRefreshRequest):
     )
 
 
+# Token counts keyed by (model, text digest); the frontend re-requests counts for
+# the same text on every re-render, and tokenization is deterministic
+_token_count_cache = TTLCache(maxsize=4096, ttl=600)
+
+# Below this length tokenizing is about as cheap as hashing, so skip the cache
+TOKEN_COUNT_CACHE_MIN_CHARS = 64
+
+
+async def count_tokens(model: str, text: str) -> int:
+    """Count tokens with LiteLLM, caching results for longer texts.
+
+    Keys hold a digest of the text rather than the text itself, so the cache
+    does not pin large conversation strings in memory. Uncached counts run in
+    a worker thread so tokenizing a long text does not stall other streams;
+    the cache itself is only touched from the event loop.
+    """
+    if len(text) < TOKEN_COUNT_CACHE_MIN_CHARS:
+        return litellm.token_counter(model=model, text=text)
+
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    key = (model, digest)
+    count = _token_count_cache.get(key)
+    if count is None:
+        count = await asyncio.to_thread(litellm.token_counter, model=model, text=text)
+        _token_count_cache.set(key, count)
+    return count
+
+
 @app.get("/api/token-count")
 async def estimate_tokens(text: str, model: str = "openai/gpt-4o"):
     """
@@ -1481,8 +2137,9 @@ async def estimate_tokens(text: str, model: str = "openai/gpt-4o"):
     Used for context budget visualization.
     """
     try:
-        # LiteLLM has a token counting utility
-        count = litellm.token_counter(model=model, text=text)
+        # LiteLLM has a token counting utility; the frontend re-requests the
+        # same text frequently, so counts are cached per (model, text)
+        count = await count_tokens(model, text)
         return {"tokens": count, "model": model}
     except Exception:
         # Fallback: rough estimate (4 chars per token)
@@ -1513,6 +2170,9 @@ class RefineQueryRequest(BaseModel):
     base_url: str | None = None
 
 
+RefineQueryBody = Annotated[RefineQueryRequest, Depends(json_body(RefineQueryRequest))]
+
+
 class RefinedQueryOutput(BaseModel):
     """Structured output for refined query - used with LLM structured generation."""
 
@@ -1529,8 +2189,13 @@ class RefinedQueryOutput(BaseModel):
     )
 
 
+_refined_query_cache = TTLCache(maxsize=1024, ttl=3600)
+# How long refined queries stay in the shared Redis cache, when configured
+SHARED_REFINED_QUERY_TTL = 3600
+
+
 @app.post("/api/refine-query")
-async def refine_query(request: RefineQueryRequest):
+async def refine_query(request: RefineQueryBody):
     """
     Use an LLM to refine a user query using surrounding context.
 
@@ -1547,6 +2212,27 @@ async def refine_query(request: RefineQueryRequest):
         f"context_length={len(request.context)}"
     )
 
+    # The same selection is often refined again (e.g. search, then research on
+    # the same node); the prompt depends only on these fields
+    cache_key = make_cache_key(
+        {
+            "model": request.model,
+            "base_url": request.base_url,
+            "api_key": api_key_digest(request.api_key),
+            "command_type": request.command_type,
+            "user_query": request.user_query,
+            "context": request.context[:2000],
+        }
+    )
+    cached_query = _refined_query_cache.get(cache_key)
+    shared_cache = _shared_cache
+    if cached_query is None and shared_cache is not None:
+        cached_query = await shared_cache.get(f"refine:{cache_key}")
+        if cached_query is not None:
+            _refined_query_cache.set(cache_key, cached_query)
+    if cached_query is not None:
+        return {"original_query": request.user_query, "refined_query": cached_query}
+
     # Different prompts for search vs research vs factcheck
     if request.command_type == "factcheck":
         system_prompt = """You are a fact-checking assistant. Given a user's query and context, extract or clarify the factual claim(s) to be verified.
@@ -1625,7 +2311,7 @@ Examples:
             logger.info(f"Using structured generation for model {request.model}")
             try:
                 kwargs["response_format"] = RefinedQueryOutput
-                response = await litellm.acompletion(**kwargs)
+                response = await limited_acompletion(**kwargs)
 
                 # With structured generation, response is already parsed
                 if hasattr(response, "choices") and response.choices:
@@ -1654,7 +2340,7 @@ Examples:
                 )
                 # Remove response_format and retry with regular completion
                 kwargs.pop("response_format", None)
-                response = await litellm.acompletion(**kwargs)
+                response = await limited_acompletion(**kwargs)
                 refined_query = response.choices[0].message.content.strip()
 
                 # Remove quotes if the LLM wrapped the query in them
@@ -1665,7 +2351,7 @@ Examples:
                 f"Model {request.model} doesn't support structured generation, "
                 "using regular completion"
             )
-            response = await litellm.acompletion(**kwargs)
+            response = await limited_acompletion(**kwargs)
             refined_query = response.choices[0].message.content.strip()
 
             # Remove quotes if the LLM wrapped the query in them
@@ -1676,13 +2362,18 @@ Examples:
         if not refined_query:
             logger.warning("LLM returned empty refined query, using original")
             refined_query = request.user_query
+        else:
+            _refined_query_cache.set(cache_key, refined_query)
+            if shared_cache is not None:
+                await shared_cache.set(
+                    f"refine:{cache_key}", refined_query, ttl=SHARED_REFINED_QUERY_TTL
+                )
 
         logger.info(f"Refined query: '{refined_query}'")
         return {"original_query": request.user_query, "refined_query": refined_query}
 
     except Exception as e:
-        logger.error(f"Failed to refine query: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Failed to refine query: {e}")
         # Fall back to the original query if LLM fails
         return {
             "original_query": request.user_query,
@@ -1843,11 +2534,27 @@ async def generate_image(request: ImageGenerationRequest):
             detail="Rate limit exceeded. Please try again later.",
         ) from e
     except Exception as e:
-        logger.error(f"Image generation error: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Image generation error: {e}")
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+@lru_cache(maxsize=32)
+def get_exa_client(api_key: str) -> AsyncExa:
+    """Get a cached async Exa client for an API key.
+
+    AsyncExa keeps a persistent httpx.AsyncClient, so reusing one client per key
+    keeps connections alive across search, research and get-contents calls
+    instead of paying a fresh TCP/TLS handshake on every request. The LRU bound
+    keeps memory flat when many different keys are used.
+    """
+    return AsyncExa(api_key=api_key)
+
+
+# Repeated searches (double-clicks, re-running a search node) are served from
+# memory for a few minutes instead of costing another Exa call
+_exa_search_cache = TTLCache(maxsize=512, ttl=600)
+
+
 @app.post("/api/exa/search")
 async def exa_search(request: ExaSearchRequest):
     """
@@ -1860,12 +2567,24 @@ async def exa_search(request: ExaSearchRequest):
         f"num_results={request.num_results}"
     )
 
+    cache_key = make_cache_key(
+        {
+            "api_key": api_key_digest(request.api_key),
+            "query": request.query,
+            "search_type": request.search_type,
+            "num_results": request.num_results,
+        }
+    )
+    cached_body = _exa_search_cache.get(cache_key)
+    if cached_body is not None:
+        return Response(content=cached_body, media_type="application/json")
+
     try:
-        exa = Exa(api_key=request.api_key)
+        exa = get_exa_client(request.api_key)
 
         # Perform search with text content
         logger.info("Calling Exa search_and_contents...")
-        results = exa.search_and_contents(
+        results = await exa.search_and_contents(
             request.query,
             type=request.search_type,
             num_results=request.num_results,
@@ -1873,32 +2592,35 @@ async def exa_search(request: ExaSearchRequest):
         )
         logger.info(f"Exa returned {len(results.results)} results")
 
-        # Format results
-        formatted_results = []
-        for i, result in enumerate(results.results):
-            logger.debug(
-                f"Processing result {i}: title={result.title}, url={result.url}"
-            )
-            formatted_results.append(
-                ExaSearchResult(
-                    title=result.title or "Untitled",
-                    url=result.url,
-                    snippet=result.text[:500] if result.text else "",
-                    published_date=result.published_date,
-                    author=result.author,
-                )
+        # Format results (Exa's typed results are trusted, so skip re-validation)
+        formatted_results = [
+            ExaSearchResult.model_construct(
+                title=result.title or "Untitled",
+                url=result.url,
+                snippet=(result.text or "")[:500],
+                published_date=result.published_date,
+                author=result.author,
             )
+            for result in results.results
+        ]
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, result in enumerate(formatted_results):
+                logger.debug(f"Result {i}: title={result.title}, url={result.url}")
 
         logger.info(f"Successfully formatted {len(formatted_results)} results")
-        return {
-            "query": request.query,
-            "results": formatted_results,
-            "num_results": len(formatted_results),
-        }
+        # Encode once in pydantic-core; cache hits then serve the same bytes
+        body = to_json(
+            {
+                "query": request.query,
+                "results": formatted_results,
+                "num_results": len(formatted_results),
+            }
+        )
+        _exa_search_cache.set(cache_key, body)
+        return Response(content=body, media_type="application/json")
 
     except Exception as e:
-        logger.error(f"Exa search failed: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Exa search failed: {e}")
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
@@ -1940,8 +2662,7 @@ async def ddg_search(request: DDGSearchRequest):
         }
 
     except Exception as e:
-        logger.error(f"DDG search failed: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"DDG search failed: {e}")
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
@@ -2013,7 +2734,8 @@ def _extract_json_array(text: str) -> list[str]:
     Includes a small best-effort fallback that extracts the first `[...]` region
     if the model wraps the JSON in extra text.
     """
-    text = (text or "").strip()
+    # Unwrap a ```json fence first so fenced answers parse on the strict path
+    text = strip_code_fence((text or "").strip())
     if not text:
         return []
 
@@ -2076,7 +2798,7 @@ async def _llm_text(
         kwargs["base_url"] = base_url
 
     kwargs = prepare_copilot_openai_request(kwargs, model, api_key)
-    response = await litellm.acompletion(**kwargs)
+    response = await limited_acompletion(**kwargs)
     return (response.choices[0].message.content or "").strip()
 
 
@@ -2583,9 +3305,10 @@ async def ddg_research(request: DDGResearchRequest):
             }
             yield {"event": "done", "data": ""}
 
+        except litellm.RateLimitError as e:
+            yield {"event": "error", "data": f"Rate limit exceeded: {e}"}
         except Exception as e:
-            logger.error(f"DDG research failed: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"DDG research failed: {e}")
             yield {"event": "error", "data": str(e)}
 
     return EventSourceResponse(generate())
@@ -2648,41 +3371,46 @@ async def exa_research(request: ExaResearchRequest):
 
     async def generate():
         try:
-            exa = Exa(api_key=request.api_key)
+            exa = get_exa_client(request.api_key)
 
             # Create research task
             logger.info("Creating Exa research task...")
-            research = exa.research.create(
+            research = await exa.research.create(
                 instructions=request.instructions,
                 model=request.model,
             )
             logger.info(f"Research task created: {research.research_id}")
 
             # Stream the research results
-            yield {"event": "status", "data": "Research started..."}
-
-            for event in exa.research.get(research.research_id, stream=True):
-                # The event object contains progress updates and final results
-                if hasattr(event, "status"):
-                    yield {"event": "status", "data": event.status}
-                if hasattr(event, "output") and event.output:
+            yield ServerSentEvent(data="Research started...", event="status")
+
+            events = await exa.research.get(research.research_id, stream=True)
+            async for event in events:
+                # The event object contains progress updates and final results.
+                # getattr with a default avoids hasattr's exception handling
+                # on every probe of every event.
+                status = getattr(event, "status", None)
+                if status:
+                    yield ServerSentEvent(data=status, event="status")
+                output = getattr(event, "output", None)
+                if output:
                     # Format the output object into readable markdown
-                    formatted = format_research_output(event.output)
+                    formatted = format_research_output(output)
                     if formatted:
-                        yield {"event": "content", "data": formatted}
-                if hasattr(event, "sources") and event.sources:
+                        yield ServerSentEvent(data=formatted, event="content")
+                sources = getattr(event, "sources", None)
+                if sources:
                     # Send sources as JSON
-                    sources_data = [
-                        {"title": s.title, "url": s.url} for s in event.sources
-                    ]
-                    yield {"event": "sources", "data": json.dumps(sources_data)}
+                    sources_data = [{"title": s.title, "url": s.url} for s in sources]
+                    yield ServerSentEvent(
+                        data=to_json(sources_data).decode(), event="sources"
+                    )
 
-            yield {"event": "done", "data": ""}
+            yield ServerSentEvent(data="", event="done")
 
         except Exception as e:
-            logger.error(f"Exa research failed: {e}")
-            logger.error(traceback.format_exc())
-            yield {"event": "error", "data": str(e)}
+            logger.exception(f"Exa research failed: {e}")
+            yield ServerSentEvent(data=str(e), event="error")
 
     return EventSourceResponse(generate())
 
@@ -2697,11 +3425,11 @@ async def exa_get_contents(request: ExaGetContentsRequest):
     logger.info(f"Exa get-contents request: url='{request.url}'")
 
     try:
-        exa = Exa(api_key=request.api_key)
+        exa = get_exa_client(request.api_key)
 
         # Fetch contents for the URL
         logger.info("Calling Exa get_contents...")
-        results = exa.get_contents(
+        results = await exa.get_contents(
             urls=[request.url],
             text={"max_characters": 10000},  # Get substantial text for summarization
         )
@@ -2723,8 +3451,7 @@ async def exa_get_contents(request: ExaGetContentsRequest):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Exa get-contents failed: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Exa get-contents failed: {e}")
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
@@ -2908,8 +3635,7 @@ async def fetch_url(request: FetchUrlRequest):
         logger.error(f"Timeout fetching URL: {request.url}")
         raise HTTPException(status_code=504, detail="Request timed out") from None
     except Exception as e:
-        logger.error(f"Fetch URL failed: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Fetch URL failed: {e}")
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
@@ -2968,8 +3694,7 @@ async def upload_file(file: UploadFile = File(...)):  # noqa: B008
         logger.warning(f"File validation failed for {file.filename}: {e}")
         raise HTTPException(status_code=400, detail=str(e)) from e
     except Exception as e:
-        logger.error(f"Failed to process file {file.filename}: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Failed to process file {file.filename}: {e}")
         raise HTTPException(
             status_code=500, detail=f"Failed to process file: {str(e)}"
         ) from e
@@ -3030,8 +3755,7 @@ async def upload_pdf(file: UploadFile = File(...)):  # noqa: B008
         logger.warning(f"PDF validation failed: {e}")
         raise HTTPException(status_code=400, detail=str(e)) from e
     except Exception as e:
-        logger.error(f"Failed to extract text from PDF: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Failed to extract text from PDF: {e}")
         raise HTTPException(
             status_code=500, detail=f"Failed to extract text from PDF: {str(e)}"
         ) from e
@@ -3123,8 +3847,7 @@ async def fetch_pdf(request: FetchPdfRequest):
             logger.warning(f"PDF validation failed: {e}")
             raise HTTPException(status_code=400, detail=str(e)) from e
         except Exception as e:
-            logger.error(f"Failed to extract text from PDF: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Failed to extract text from PDF: {e}")
             raise HTTPException(
                 status_code=500, detail=f"Failed to extract text from PDF: {str(e)}"
             ) from e
@@ -3135,8 +3858,7 @@ async def fetch_pdf(request: FetchPdfRequest):
         logger.error(f"Timeout fetching PDF: {request.url}")
         raise HTTPException(status_code=504, detail="Request timed out") from None
     except Exception as e:
-        logger.error(f"Failed to fetch PDF: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Failed to fetch PDF: {e}")
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
@@ -3161,23 +3883,14 @@ class GenerateSummaryRequest(BaseModel):
     base_url: str | None = None
 
 
-@app.post("/api/generate-title")
-async def generate_title(request: GenerateTitleRequest):
-    """
-    Generate a session title based on conversation content.
+class TitleResponse(BaseModel):
+    """Response body for generating a session title."""
 
-    Returns a short, descriptive title for the canvas session.
-    """
-    # Inject admin credentials if in admin mode
-    inject_admin_credentials(request)
-
-    logger.info(f"Generate title request: content length={len(request.content)}")
+    title: str
 
-    provider = extract_provider(request.model)
 
-    system_prompt = (
-        """Generate a short, descriptive title for a conversation/session """
-        """based on the content provided.
+GENERATE_TITLE_SYSTEM_PROMPT = """Generate a short, descriptive title for a \
+conversation/session based on the content provided.
 
 Rules:
 - Return ONLY the title text, no quotes or extra formatting
@@ -3193,13 +3906,29 @@ Examples of good titles:
 - "Machine Learning Model Optimization"
 - "React Component Architecture"
 """
-    )
+
+
+# Models often wrap short answers in quotes and stray whitespace
+QUOTE_AND_SPACE_CHARS = " \t\r\n\"'"
+
+
+@app.post("/api/generate-title", response_model=TitleResponse)
+async def generate_title(request: GenerateTitleRequest):
+    """
+    Generate a session title based on conversation content.
+
+    Returns a short, descriptive title for the canvas session.
+    """
+    # Inject admin credentials if in admin mode
+    inject_admin_credentials(request)
+
+    logger.info("Generate title request: content length=%d", len(request.content))
 
     try:
         kwargs = {
             "model": request.model,
             "messages": [
-                {"role": "system", "content": system_prompt},
+                build_system_message(GENERATE_TITLE_SYSTEM_PROMPT, request.model),
                 {
                     "role": "user",
                     "content": (
@@ -3211,47 +3940,34 @@ Examples of good titles:
             "max_tokens": 50,
         }
 
-        api_key = get_api_key_for_provider(provider, request.api_key)
-        if api_key:
-            kwargs["api_key"] = api_key
+        # Without an explicit key, LiteLLM falls back to environment variables
+        if request.api_key:
+            kwargs["api_key"] = request.api_key
 
         if request.base_url:
             kwargs["base_url"] = request.base_url
 
-        kwargs = prepare_copilot_openai_request(kwargs, request.model, api_key)
-
-        response = await litellm.acompletion(**kwargs)
-        title = response.choices[0].message.content.strip()
+        kwargs = prepare_copilot_openai_request(kwargs, request.model, request.api_key)
 
-        # Clean up any quotes or extra formatting
-        title = title.strip("\"'")
+        response = await limited_acompletion(**kwargs)
+        # Clean up surrounding whitespace and quotes in one pass
+        title = response.choices[0].message.content.strip(QUOTE_AND_SPACE_CHARS)
 
-        logger.info(f"Generated title: {title}")
+        logger.info("Generated title: %s", title)
         return {"title": title}
 
+    except litellm.RateLimitError as e:
+        raise HTTPException(
+            status_code=429,
+            detail="Rate limit exceeded. Please try again later.",
+        ) from e
     except Exception as e:
-        logger.error(f"Generate title failed: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception("Generate title failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
-@app.post("/api/generate-summary")
-async def generate_summary(request: GenerateSummaryRequest):
-    """
-    Generate a short summary of node content for semantic zoom.
-
-    Returns a concise 5-10 word summary suitable for display when zoomed out.
-    """
-    # Inject admin credentials if in admin mode
-    inject_admin_credentials(request)
-
-    logger.info(f"Generate summary request: content length={len(request.content)}")
-
-    provider = extract_provider(request.model)
-
-    system_prompt = (
-        """Generate a very short summary (5-10 words) """
-        """for the following content.
+GENERATE_SUMMARY_SYSTEM_PROMPT = """Generate a very short summary (5-10 words) \
+for the following content.
 
 Rules:
 - Return ONLY the summary text, no quotes or formatting
@@ -3266,54 +3982,113 @@ Examples:
 - "Debugging React state management issues"
 - "Benefits of microservices architecture"
 """
-    )
 
+# Semantic zoom asks for the same node summaries again after every reload, so
+# cache them like /api/summarize. Titles are not cached: regenerating a title
+# is expected to give a new one.
+_node_summary_cache = TTLCache(maxsize=1024, ttl=3600)
+_node_summary_inflight: dict[tuple, asyncio.Task] = {}
+
+# Only the start of a node is summarized. Slicing a str that is already
+# shorter returns the same object, so short nodes are not copied.
+NODE_SUMMARY_MAX_CHARS = 2000
+
+
+def fallback_node_summary(content: str) -> str:
+    """Summarize a node as its first few words when the LLM gives nothing usable."""
+    fallback = " ".join(content[:100].split()[:8])
+    return fallback + "..." if len(fallback) >= 50 else fallback
+
+
+@app.post("/api/generate-summary", response_model=SummaryResponse)
+async def generate_summary(request: GenerateSummaryRequest):
+    """
+    Generate a short summary of node content for semantic zoom.
+
+    Returns a concise 5-10 word summary suitable for display when zoomed out.
+    """
+    # Inject admin credentials if in admin mode
+    inject_admin_credentials(request)
+
+    logger.info("Generate summary request: content length=%d", len(request.content))
+
+    # The prompt and sampling parameters are fixed, so the summary depends only
+    # on the model, endpoint, credential and (truncated) content. Look it up
+    # before building any request state.
+    content_digest = hashlib.blake2b(
+        request.content[:NODE_SUMMARY_MAX_CHARS].encode(), digest_size=16
+    ).digest()
+    cache_key = (
+        request.model,
+        request.base_url,
+        api_key_digest(request.api_key),
+        content_digest,
+    )
+    cached_summary = _node_summary_cache.get(cache_key)
+    if cached_summary is not None:
+        return {"summary": cached_summary}
+
+    # Duplicated nodes ask for the same summary at the same time; share one LLM
+    # call between them. The shield keeps one client disconnecting from
+    # cancelling the call the others are waiting on.
+    task = _node_summary_inflight.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(request_node_summary(request, cache_key))
+        _node_summary_inflight[cache_key] = task
+        task.add_done_callback(lambda _: _node_summary_inflight.pop(cache_key, None))
+    return await asyncio.shield(task)
+
+
+async def request_node_summary(
+    request: GenerateSummaryRequest, cache_key: tuple
+) -> dict[str, str]:
+    """Ask the LLM for a node summary and cache it under cache_key."""
     try:
         kwargs = {
             "model": request.model,
             "messages": [
-                {"role": "system", "content": system_prompt},
+                build_system_message(GENERATE_SUMMARY_SYSTEM_PROMPT, request.model),
                 {
                     "role": "user",
-                    "content": f"Summarize this content:\n\n{request.content[:2000]}",  # noqa: E501
+                    "content": (
+                        "Summarize this content:\n\n"
+                        + request.content[:NODE_SUMMARY_MAX_CHARS]
+                    ),
                 },
             ],
             "temperature": 0.5,
             "max_tokens": 30,
         }
 
-        api_key = get_api_key_for_provider(provider, request.api_key)
-        if api_key:
-            kwargs["api_key"] = api_key
+        # Without an explicit key, LiteLLM falls back to environment variables
+        if request.api_key:
+            kwargs["api_key"] = request.api_key
 
         if request.base_url:
             kwargs["base_url"] = request.base_url
 
-        kwargs = prepare_copilot_openai_request(kwargs, request.model, api_key)
+        kwargs = prepare_copilot_openai_request(kwargs, request.model, request.api_key)
 
-        response = await litellm.acompletion(**kwargs)
+        response = await limited_acompletion(**kwargs)
         content = response.choices[0].message.content
 
         # Handle None or empty content from LLM
         if not content:
             logger.warning("LLM returned empty content for summary, using fallback")
             # Return fallback instead of raising error
-            fallback = " ".join(request.content[:100].split()[:8])
-            return {"summary": fallback + "..." if len(fallback) >= 50 else fallback}
-
-        summary = content.strip()
+            return {"summary": fallback_node_summary(request.content)}
 
-        # Clean up any quotes or extra formatting
-        summary = summary.strip("\"'")
+        # Clean up surrounding whitespace and quotes in one pass
+        summary = content.strip(QUOTE_AND_SPACE_CHARS)
 
         # Final check for empty summary after cleanup
         if not summary:
             logger.warning("Summary is empty after cleanup, using fallback")
             # Return fallback instead of raising error
-            fallback = " ".join(request.content[:100].split()[:8])
-            return {"summary": fallback + "..." if len(fallback) >= 50 else fallback}
+            return {"summary": fallback_node_summary(request.content)}
 
-        logger.info(f"Generated summary: {summary}")
+        logger.info("Generated summary: %s", summary)
+        _node_summary_cache.set(cache_key, summary)
         return {"summary": summary}
 
     except litellm.APIConnectionError as e:
@@ -3321,50 +4096,65 @@ Examples:
         error_str = str(e).lower()
         if "max_tokens" in error_str or "finishreason" in error_str:
             logger.warning(
-                f"Gemini MAX_TOKENS parsing error (LiteLLM bug): {e}. "
-                "Using fallback summary."
+                "Gemini MAX_TOKENS parsing error (LiteLLM bug): %s. "
+                "Using fallback summary.",
+                e,
             )
             # Return a fallback: use first few words of content
-            fallback = " ".join(request.content[:100].split()[:8])
-            return {"summary": fallback + "..." if len(fallback) >= 50 else fallback}
+            return {"summary": fallback_node_summary(request.content)}
         # Re-raise other APIConnectionErrors
         raise
 
+    except litellm.RateLimitError as e:
+        raise HTTPException(
+            status_code=429,
+            detail="Rate limit exceeded. Please try again later.",
+        ) from e
     except Exception as e:
-        logger.error(f"Generate summary failed: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception("Generate summary failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
 # --- Committee Endpoint ---
 
 
+# Map provider names to the frontend's API key storage keys
+PROVIDER_API_KEY_NAMES: dict[str, str | None] = {
+    "openai": "openai",
+    "anthropic": "anthropic",
+    "gemini": "google",
+    "google": "google",
+    "groq": "groq",
+    "github": "github",
+    "github_copilot": "github_copilot",
+    "ollama": None,  # Ollama doesn't need API key
+    "ollama_chat": None,
+}
+
+
 def get_api_key_for_model(model: str, api_keys: dict[str, str]) -> str | None:
     """Get the API key for a model from the api_keys dict."""
     provider = extract_provider(model)
-    # Map provider names to storage keys
-    provider_map = {
-        "openai": "openai",
-        "anthropic": "anthropic",
-        "gemini": "google",
-        "google": "google",
-        "groq": "groq",
-        "github": "github",
-        "github_copilot": "github_copilot",
-        "ollama": None,  # Ollama doesn't need API key
-        "ollama_chat": None,
-    }
-    key_name = provider_map.get(provider.lower())
+    key_name = PROVIDER_API_KEY_NAMES.get(provider.lower())
     if key_name:
         return api_keys.get(key_name)
     return None
 
 
+def committee_sse_event(event: dict) -> ServerSentEvent:
+    """Encode a committee queue event as an SSE event with a JSON payload.
+
+    Opinion and review chunks arrive once per token, so the payload is encoded
+    with pydantic-core rather than json.dumps.
+    """
+    return ServerSentEvent(data=to_json(event["data"]).decode(), event=event["event"])
+
+
 async def stream_single_opinion(
     index: int,
     model: str,
     question: str,
-    context: list[dict],
+    context: list[Message],
     api_key: str | None,
     base_url: str | None,
     queue: asyncio.Queue,
@@ -3384,9 +4174,10 @@ async def stream_single_opinion(
 
         messages = [{"role": "system", "content": system_prompt}]
 
-        # Add conversation context
-        for msg in context:
-            messages.append({"role": msg["role"], "content": msg["content"]})
+        # Add conversation context. Each member gets its own dicts (dumped in
+        # one pydantic-core call) since calls run concurrently and LiteLLM may
+        # adjust messages in place.
+        messages.extend(_MESSAGES_ADAPTER.dump_python(context))
 
         # Add the question
         messages.append({"role": "user", "content": question})
@@ -3405,20 +4196,20 @@ async def stream_single_opinion(
 
         kwargs = prepare_copilot_openai_request(kwargs, model, api_key)
 
-        response = await litellm.acompletion(**kwargs)
-        full_content = ""
+        response = await limited_acompletion(**kwargs)
+        # Collect parts and join once instead of growing a string per token
+        parts: list[str] = []
 
-        async for chunk in response:
-            if chunk.choices and chunk.choices[0].delta.content:
-                content = chunk.choices[0].delta.content
-                full_content += content
-                await queue.put(
-                    {
-                        "event": "opinion_chunk",
-                        "data": {"index": index, "content": content},
-                    }
-                )
+        async for content in iter_content_deltas(response):
+            parts.append(content)
+            await queue.put(
+                {
+                    "event": "opinion_chunk",
+                    "data": {"index": index, "content": content},
+                }
+            )
 
+        full_content = "".join(parts)
         await queue.put(
             {
                 "event": "opinion_done",
@@ -3498,20 +4289,19 @@ Please review and rank these opinions.""",
 
         kwargs = prepare_copilot_openai_request(kwargs, reviewer_model, api_key)
 
-        response = await litellm.acompletion(**kwargs)
-        full_content = ""
+        response = await limited_acompletion(**kwargs)
+        parts: list[str] = []
 
-        async for chunk in response:
-            if chunk.choices and chunk.choices[0].delta.content:
-                content = chunk.choices[0].delta.content
-                full_content += content
-                await queue.put(
-                    {
-                        "event": "review_chunk",
-                        "data": {"reviewer_index": reviewer_index, "content": content},
-                    }
-                )
+        async for content in iter_content_deltas(response):
+            parts.append(content)
+            await queue.put(
+                {
+                    "event": "review_chunk",
+                    "data": {"reviewer_index": reviewer_index, "content": content},
+                }
+            )
 
+        full_content = "".join(parts)
         await queue.put(
             {
                 "event": "review_done",
@@ -3536,7 +4326,7 @@ Please review and rank these opinions.""",
 
 
 @app.post("/api/committee")
-async def committee(request: CommitteeRequest):
+async def committee(request: CommitteeBody):
     """
     Run an LLM committee to answer a question.
 
@@ -3566,9 +4356,6 @@ async def committee(request: CommitteeRequest):
 
     async def generate():
         try:
-            # Convert context messages to dicts
-            context = [{"role": m.role, "content": m.content} for m in request.context]
-
             # Phase 1: Gather opinions in parallel
             queue: asyncio.Queue = asyncio.Queue()
             opinion_tasks = []
@@ -3580,7 +4367,7 @@ async def committee(request: CommitteeRequest):
                         index=i,
                         model=model,
                         question=request.question,
-                        context=context,
+                        context=request.context,
                         api_key=api_key,
                         base_url=request.base_url,
                         queue=queue,
@@ -3595,7 +4382,7 @@ async def committee(request: CommitteeRequest):
             while opinions_done < len(request.models):
                 try:
                     event = await asyncio.wait_for(queue.get(), timeout=0.1)
-                    yield {"event": event["event"], "data": json.dumps(event["data"])}
+                    yield committee_sse_event(event)
 
                     if event["event"] == "opinion_done":
                         opinions_done += 1
@@ -3614,10 +4401,7 @@ async def committee(request: CommitteeRequest):
                         # Drain remaining queue events
                         while not queue.empty():
                             event = await queue.get()
-                            yield {
-                                "event": event["event"],
-                                "data": json.dumps(event["data"]),
-                            }
+                            yield committee_sse_event(event)
                             if event["event"] == "opinion_done":
                                 idx = event["data"]["index"]
                                 opinions[idx] = {
@@ -3664,10 +4448,7 @@ async def committee(request: CommitteeRequest):
                 while reviews_done < expected_reviews:
                     try:
                         event = await asyncio.wait_for(review_queue.get(), timeout=0.1)
-                        yield {
-                            "event": event["event"],
-                            "data": json.dumps(event["data"]),
-                        }
+                        yield committee_sse_event(event)
 
                         if event["event"] == "review_done":
                             reviews_done += 1
@@ -3680,10 +4461,7 @@ async def committee(request: CommitteeRequest):
                         if all(task.done() for task in review_tasks):
                             while not review_queue.empty():
                                 event = await review_queue.get()
-                                yield {
-                                    "event": event["event"],
-                                    "data": json.dumps(event["data"]),
-                                }
+                                yield committee_sse_event(event)
                                 if event["event"] == "review_done":
                                     idx = event["data"]["reviewer_index"]
                                     reviews[idx] = event["data"]["full_content"]
@@ -3693,10 +4471,9 @@ async def committee(request: CommitteeRequest):
                 await asyncio.gather(*review_tasks, return_exceptions=True)
 
             # Phase 3: Chairman synthesis
-            yield {
-                "event": "synthesis_start",
-                "data": json.dumps({"model": request.chairman_model}),
-            }
+            yield committee_sse_event(
+                {"event": "synthesis_start", "data": {"model": request.chairman_model}}
+            )
 
             # Build synthesis prompt
             opinions_text = "\n\n".join(
@@ -3760,28 +4537,26 @@ Provide your own assessment of the most accurate and helpful response."""
                 kwargs, request.chairman_model, chairman_api_key
             )
 
-            response = await litellm.acompletion(**kwargs)
-            synthesis_content = ""
+            response = await limited_acompletion(**kwargs)
+            synthesis_parts: list[str] = []
 
-            async for chunk in response:
-                if chunk.choices and chunk.choices[0].delta.content:
-                    content = chunk.choices[0].delta.content
-                    synthesis_content += content
-                    yield {
-                        "event": "synthesis_chunk",
-                        "data": json.dumps({"content": content}),
-                    }
+            async for content in iter_content_deltas(response):
+                synthesis_parts.append(content)
+                yield committee_sse_event(
+                    {"event": "synthesis_chunk", "data": {"content": content}}
+                )
 
-            yield {
-                "event": "synthesis_done",
-                "data": json.dumps({"full_content": synthesis_content}),
-            }
-            yield {"event": "done", "data": ""}
+            yield committee_sse_event(
+                {
+                    "event": "synthesis_done",
+                    "data": {"full_content": "".join(synthesis_parts)},
+                }
+            )
+            yield ServerSentEvent(data="", event="done")
 
         except Exception as e:
-            logger.error(f"Committee failed: {e}")
-            logger.error(traceback.format_exc())
-            yield {"event": "error", "data": json.dumps({"message": str(e)})}
+            logger.exception(f"Committee failed: {e}")
+            yield committee_sse_event({"event": "error", "data": {"message": str(e)}})
 
     return EventSourceResponse(generate())
 
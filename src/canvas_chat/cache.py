@@ -0,0 +1,84 @@
+"""In-process response caches for canvas-chat.
+
+Provides a small LRU cache with per-entry expiry, used to avoid repeating
+identical LLM calls and upstream fetches.
+
+The cache is not thread-safe. It is meant to be used from the asyncio event
+loop, where get/set never yield, so no lock is needed.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+
+def make_cache_key(payload: Any) -> str:
+    """Build a stable cache key from a JSON-serializable payload.
+
+    Args:
+        payload: Request parameters that determine the response
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON encoding
+    """
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def api_key_digest(api_key: str | None) -> str:
+    """Return a digest of api_key for use in cache keys.
+
+    Keying cached responses on the credential means a caller with a missing or
+    revoked key cannot be served a response another caller's key paid for, and
+    still gets the provider's auth error. The raw key is never stored.
+    """
+    return hashlib.blake2b((api_key or "").encode(), digest_size=16).hexdigest()
+
+
+class TTLCache:
+    """Least-recently-used cache whose entries expire after a fixed TTL.
+
+    Args:
+        maxsize: Maximum number of entries kept before evicting the oldest
+        ttl: Seconds an entry stays valid after it is stored
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry if full."""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_MISSING = object()
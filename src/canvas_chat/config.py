@@ -20,13 +20,28 @@ Key design principles:
 import logging
 import os
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
+from typing import Any
 
 from ruamel.yaml import YAML
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8)
+def _read_config_file(path: Path, mtime_ns: int, size: int) -> Any:
+    """Parse a YAML config file, memoized on its modification time and size.
+
+    The CLI loads the config to validate it, then the app loads it again in
+    the same process when it starts, so the second load skips the parse. The
+    returned data is shared between calls and must not be modified.
+    """
+    yaml = YAML(typ="safe")
+    with path.open() as f:
+        return yaml.load(f)
+
+
 @dataclass
 class ModelConfig:
     """Configuration for a single model.
@@ -214,6 +229,17 @@ class AppConfig:
     plugins: list[PluginConfig] = field(default_factory=list)
     admin_mode: bool = False
     _config_path: Path | None = None
+    # Built once from models; config is not modified after it is loaded
+    _models_by_id: dict[str, ModelConfig] = field(init=False, repr=False, compare=False)
+    _frontend_models: list[dict] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self._models_by_id = {}
+        for model in self.models:
+            # Keep the first entry when an ID is listed twice
+            self._models_by_id.setdefault(model.id, model)
 
     @classmethod
     def load(
@@ -241,9 +267,8 @@ class AppConfig:
                 f"See config.example.yaml for format."
             )
 
-        yaml = YAML(typ="safe")
-        with config_path.open() as f:
-            data = yaml.load(f)
+        stat = config_path.stat()
+        data = _read_config_file(config_path.resolve(), stat.st_mtime_ns, stat.st_size)
 
         if not data:
             raise ValueError(f"Config file {config_path} is empty or invalid YAML")
@@ -314,10 +339,12 @@ class AppConfig:
         if not self.admin_mode:
             return  # No validation needed in normal mode
 
-        missing = []
-        for model in self.models:
-            if model.api_key_env_var and not os.environ.get(model.api_key_env_var):
-                missing.append((model.id, model.api_key_env_var))
+        env = os.environ
+        missing = [
+            (model.id, model.api_key_env_var)
+            for model in self.models
+            if model.api_key_env_var and not env.get(model.api_key_env_var)
+        ]
 
         if missing:
             error_lines = [
@@ -337,10 +364,7 @@ class AppConfig:
         Returns:
             ModelConfig if found, None otherwise
         """
-        for model in self.models:
-            if model.id == model_id:
-                return model
-        return None
+        return self._models_by_id.get(model_id)
 
     def resolve_credentials(self, model_id: str) -> tuple[str | None, str | None]:
         """Resolve API key and endpoint for a model.
@@ -379,12 +403,17 @@ class AppConfig:
         - provider: Extracted from ID
         - context_window: Token limit
 
-        No API keys or environment variable names are included.
+        No API keys or environment variable names are included. The list is
+        built on first use and shared by later calls.
         """
+        if self._frontend_models is not None:
+            return self._frontend_models
+
         result = []
         for model in self.models:
             # Extract provider from model ID (first part before /)
-            provider = model.id.split("/")[0] if "/" in model.id else "Unknown"
+            prefix, sep, _ = model.id.partition("/")
+            provider = prefix if sep else "Unknown"
             # Capitalize provider for display
             provider = provider.capitalize()
 
@@ -396,6 +425,7 @@ class AppConfig:
                     "context_window": model.context_window,
                 }
             )
+        self._frontend_models = result
         return result
 
 
@@ -0,0 +1,97 @@
+"""Fast JSON request body parsing for hot endpoints.
+
+FastAPI decodes request bodies with ``json.loads`` and then validates the
+resulting Python objects. For large bodies (long conversation histories) it is
+cheaper to let pydantic-core parse and validate the raw bytes in one pass with
+``model_validate_json``.
+
+Because the body is read by a dependency rather than declared as a body
+parameter, FastAPI does not document it; ``document_json_bodies`` adds the
+request schemas back to the app's OpenAPI output.
+"""
+
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from fastapi import FastAPI, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, ValidationError
+from pydantic.json_schema import models_json_schema
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def json_body(model: type[ModelT]) -> Callable[[Request], Awaitable[ModelT]]:
+    """Build a dependency that validates the raw request body as model.
+
+    Use as ``request: MyRequest = Depends(json_body(MyRequest))``. Invalid
+    bodies produce the same 422 response FastAPI gives for body parameters.
+
+    Args:
+        model: Pydantic model describing the JSON body
+
+    Returns:
+        A FastAPI dependency returning the validated model instance
+    """
+
+    async def parse_body(request: Request) -> ModelT:
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as e:
+            errors = [
+                {**error, "loc": ("body", *error["loc"])}
+                for error in e.errors(include_url=False)
+            ]
+            raise RequestValidationError(errors) from e
+
+    parse_body.body_model = model
+    return parse_body
+
+
+def document_json_bodies(app: FastAPI) -> None:
+    """Add json_body request schemas to app's OpenAPI output.
+
+    Wraps ``app.openapi`` so that every route with a json_body dependency gets
+    the same ``requestBody`` (and component schemas) a typed body parameter
+    would have produced.
+
+    Args:
+        app: Application whose routes use json_body dependencies
+    """
+    generate_openapi = app.openapi
+
+    def openapi() -> dict[str, Any]:
+        if app.openapi_schema is not None:
+            return app.openapi_schema
+        schema = generate_openapi()
+        bodies: dict[tuple[str, str], type[BaseModel]] = {}
+        for route in app.routes:
+            if not isinstance(route, APIRoute):
+                continue
+            for dependency in route.dependant.dependencies:
+                model = getattr(dependency.call, "body_model", None)
+                if model is not None:
+                    for method in route.methods:
+                        bodies[(route.path_format, method.lower())] = model
+        if not bodies:
+            return schema
+
+        refs, definitions = models_json_schema(
+            [(model, "validation") for model in set(bodies.values())],
+            ref_template="#/components/schemas/{model}",
+        )
+        components = schema.setdefault("components", {}).setdefault("schemas", {})
+        for name, definition in definitions.get("$defs", {}).items():
+            components.setdefault(name, definition)
+        for (path, method), model in bodies.items():
+            operation = schema["paths"][path][method]
+            operation["requestBody"] = {
+                "content": {
+                    "application/json": {"schema": refs[(model, "validation")]}
+                },
+                "required": True,
+            }
+        return schema
+
+    app.openapi = openapi
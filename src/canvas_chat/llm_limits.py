@@ -0,0 +1,224 @@
+"""Backpressure for outbound LLM calls.
+
+Caps how many upstream LLM requests run at once across the process and can
+rate-limit each API key, so bursts (e.g. filling every cell of a large matrix)
+do not fan out into provider 429s. Calls beyond the cap queue fairly: freed
+slots rotate between the API keys that are waiting, so one key's backlog
+cannot starve other keys. An optional queue timeout fails calls with
+LLMSaturatedError instead of waiting longer.
+
+Streaming responses hold their concurrency slot until the stream is exhausted,
+fails, or is closed with ``aclose()`` (e.g. after a client disconnect).
+"""
+
+import asyncio
+import contextlib
+import time
+import weakref
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+from canvas_chat.cache import TTLCache, api_key_digest
+
+
+class TokenBucket:
+    """Token bucket allowing bursts up to capacity, refilled at a fixed rate.
+
+    Args:
+        rate: Tokens added per second
+        capacity: Maximum tokens the bucket can hold
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def try_acquire(self) -> bool:
+        """Take one token if available.
+
+        Returns:
+            True if a token was taken, False if the bucket is empty
+        """
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+
+def _release_on_loop(loop: asyncio.AbstractEventLoop, release: Callable[[], None]):
+    """Schedule release on loop; used when a stream is dropped unclosed."""
+    # Finalizers may run on any thread, and semaphores are not thread-safe
+    with contextlib.suppress(RuntimeError):  # loop already closed
+        loop.call_soon_threadsafe(release)
+
+
+class _LimitedStream:
+    """Async iterator that holds a concurrency slot until it is closed.
+
+    The slot is released when the stream is exhausted or fails, or when
+    ``aclose()`` is called. A stream dropped before anyone iterates or closes
+    it releases its slot on the event loop once it is collected.
+    """
+
+    def __init__(self, stream: Any, release: Callable[[], None]):
+        self._stream = stream
+        self._release_slot = release
+        self._finalizer = weakref.finalize(
+            self, _release_on_loop, asyncio.get_running_loop(), release
+        )
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            return await self._stream.__anext__()
+        except BaseException:
+            self._release()
+            raise
+
+    async def aclose(self) -> None:
+        """Release the slot and close the underlying stream."""
+        self._release()
+        aclose = getattr(self._stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    def _release(self) -> None:
+        # detach() returns None once the slot has been released
+        if self._finalizer.detach() is not None:
+            self._release_slot()
+
+
+class LLMSaturatedError(Exception):
+    """Raised when no concurrency slot frees up within the queue timeout."""
+
+
+class LLMLimiter:
+    """Global concurrency limit with a fair queue, plus optional per-key rate limit.
+
+    When every slot is taken, callers queue per API key and freed slots go to
+    the waiting keys in turn, so one key with many queued calls (e.g. a large
+    matrix fill) cannot starve other keys' requests.
+
+    Args:
+        max_concurrent: Maximum upstream LLM calls in flight at once
+        requests_per_minute: Per-key request budget; 0 disables rate limiting
+        queue_timeout: Seconds a call may wait for a free slot; None waits as
+            long as needed and 0 fails at once when all slots are taken
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        requests_per_minute: int = 0,
+        queue_timeout: float | None = None,
+    ):
+        self.max_concurrent = max_concurrent
+        self.requests_per_minute = requests_per_minute
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        # Queued callers per key digest; dict order is the round-robin rotation
+        self._waiters: dict[str, deque[asyncio.Future]] = {}
+        # Buckets expire after an idle period so unused keys do not accumulate
+        self._buckets = TTLCache(maxsize=4096, ttl=600)
+
+    def check_rate(self, api_key: str | None) -> bool:
+        """Consume one request from the key's budget.
+
+        Requests without an explicit key share the server's budget.
+
+        Returns:
+            True if the request may proceed, False if the key is over its limit
+        """
+        if self.requests_per_minute <= 0:
+            return True
+        # Key buckets on a digest so raw credentials are not kept in memory
+        key = api_key_digest(api_key)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(
+                rate=self.requests_per_minute / 60,
+                capacity=self.requests_per_minute,
+            )
+        # Re-store on every use to refresh the idle TTL
+        self._buckets.set(key, bucket)
+        return bucket.try_acquire()
+
+    async def call(self, func: Callable[..., Awaitable[Any]], **kwargs: Any) -> Any:
+        """Await func(**kwargs) while holding a concurrency slot.
+
+        For ``stream=True`` calls the returned stream is wrapped so the slot is
+        held until it finishes rather than released once headers arrive.
+
+        Raises:
+            LLMSaturatedError: If no slot frees up within queue_timeout seconds
+        """
+        await self._acquire(api_key_digest(kwargs.get("api_key")))
+        try:
+            response = await func(**kwargs)
+        except BaseException:
+            self._release()
+            raise
+        if not kwargs.get("stream"):
+            self._release()
+            return response
+        return _LimitedStream(response, self._release)
+
+    async def _acquire(self, key: str) -> None:
+        """Take a concurrency slot, queueing behind other callers if needed."""
+        if self.in_flight < self.max_concurrent and not self._waiters:
+            self.in_flight += 1
+            return
+        if self.queue_timeout is not None and self.queue_timeout <= 0:
+            raise LLMSaturatedError(f"All {self.max_concurrent} LLM slots are in use")
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(key, deque()).append(waiter)
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await waiter
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted as the wait ended: hand it on
+                self._release()
+            else:
+                self._discard(key, waiter)
+            if isinstance(e, TimeoutError):
+                raise LLMSaturatedError(
+                    f"All {self.max_concurrent} LLM slots stayed in use for "
+                    f"{self.queue_timeout:g}s"
+                ) from None
+            raise
+
+    def _release(self) -> None:
+        """Free a slot and grant it to the next waiting key in the rotation."""
+        self.in_flight -= 1
+        while self._waiters:
+            key = next(iter(self._waiters))
+            queue = self._waiters.pop(key)
+            waiter = queue.popleft()
+            if queue:
+                # Move the key to the back so other keys go first next time
+                self._waiters[key] = queue
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+                return
+
+    def _discard(self, key: str, waiter: asyncio.Future) -> None:
+        """Remove an abandoned waiter from its key's queue."""
+        queue = self._waiters.get(key)
+        if queue is None:
+            return
+        with contextlib.suppress(ValueError):
+            queue.remove(waiter)
+        if not queue:
+            del self._waiters[key]
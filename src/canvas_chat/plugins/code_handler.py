@@ -7,7 +7,6 @@ Returns SSE stream of generated code tokens.
 """
 
 import logging
-import traceback
 
 from fastapi import Request
 from pydantic import BaseModel
@@ -77,8 +76,10 @@ def register_endpoints(app):
         try:
             # Import here to avoid circular imports
             from canvas_chat.app import (
-                extract_provider,
-                get_api_key_for_provider,
+                coalesce_deltas,
+                encode_message_event,
+                iter_content_deltas,
+                limited_acompletion,
                 litellm,
                 prepare_copilot_openai_request,
             )
@@ -158,10 +159,6 @@ def register_endpoints(app):
                 {"role": "user", "content": request.prompt},
             ]
 
-            # Get API credentials
-            provider = extract_provider(request.model)
-            api_key = get_api_key_for_provider(provider, request.api_key)
-
             kwargs = {
                 "model": request.model,
                 "messages": messages,
@@ -169,20 +166,21 @@ def register_endpoints(app):
                 "stream": True,
             }
 
-            if api_key:
-                kwargs["api_key"] = api_key
+            if request.api_key:
+                kwargs["api_key"] = request.api_key
             if request.base_url:
                 kwargs["base_url"] = request.base_url
 
-            kwargs = prepare_copilot_openai_request(kwargs, request.model, api_key)
+            kwargs = prepare_copilot_openai_request(
+                kwargs, request.model, request.api_key
+            )
 
             async def generate():
                 try:
-                    response = await litellm.acompletion(**kwargs)
-                    async for chunk in response:
-                        if chunk.choices and chunk.choices[0].delta.content:
-                            content = chunk.choices[0].delta.content
-                            yield {"event": "message", "data": content}
+                    response = await limited_acompletion(**kwargs)
+                    # Coalesce tokens so each SSE event carries several of them
+                    async for content in coalesce_deltas(iter_content_deltas(response)):
+                        yield encode_message_event(content)
                     yield {"event": "done", "data": ""}
                 except litellm.AuthenticationError as e:
                     logger.error(f"Authentication error: {e}")
@@ -191,15 +189,13 @@ def register_endpoints(app):
                     logger.error(f"Rate limit error: {e}")
                     yield {"event": "error", "data": f"Rate limit exceeded: {e}"}
                 except Exception as e:
-                    logger.error(f"Code generation error: {e}")
-                    logger.error(traceback.format_exc())
+                    logger.exception(f"Code generation error: {e}")
                     yield {"event": "error", "data": f"Code generation failed: {e}"}
 
             return EventSourceResponse(generate())
 
         except Exception as e:
-            logger.error(f"Code generation setup failed: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Code generation setup failed: {e}")
             raise HTTPException(status_code=500, detail=str(e)) from e
 
     logger.info("Code generation endpoint registered via plugin")
@@ -882,10 +882,7 @@ def register_endpoints(app):
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"List URL fetch files failed: {e}")
-            import traceback
-
-            logger.error(traceback.format_exc())
+            logger.exception(f"List URL fetch files failed: {e}")
             raise HTTPException(status_code=500, detail=str(e)) from e
 
     @app.post("/api/url-fetch/fetch-files")
@@ -1004,16 +1001,10 @@ def register_endpoints(app):
                 )
                 return fetch_result
             except Exception as create_error:
-                logger.error(f"Failed to create FetchUrlResult: {create_error}")
-                import traceback
-
-                logger.error(traceback.format_exc())
+                logger.exception(f"Failed to create FetchUrlResult: {create_error}")
                 raise
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Fetch URL fetch files failed: {e}")
-            import traceback
-
-            logger.error(traceback.format_exc())
+            logger.exception(f"Fetch URL fetch files failed: {e}")
             raise HTTPException(status_code=500, detail=str(e)) from e
@@ -5,18 +5,31 @@ Handles matrix-specific API endpoints for parsing rows/columns from context
 and filling matrix cells.
 """
 
-import json
 import logging
 import re
-import traceback
+from typing import Annotated
 
-from fastapi import HTTPException
-from pydantic import BaseModel
+from fastapi import Depends, HTTPException
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from pydantic_core import to_json
+from sse_starlette import ServerSentEvent
 from sse_starlette.sse import EventSourceResponse
 
+from canvas_chat.json_body import json_body
+
 logger = logging.getLogger(__name__)
 
 
+# Markdown code fence around an LLM's JSON answer, e.g. ```json\n{...}\n```
+CODE_FENCE_RE = re.compile(r"```(?:json)?[ \t]*\n?(.*?)\n?[ \t]*```", re.DOTALL | re.I)
+
+
+def strip_code_fence(text: str) -> str:
+    """Return the contents of the first markdown code fence, or text unchanged."""
+    fence_match = CODE_FENCE_RE.search(text)
+    return fence_match.group(1).strip() if fence_match else text
+
+
 class ParseTwoListsRequest(BaseModel):
     """Request body for parsing two lists from context nodes."""
 
@@ -27,6 +40,20 @@ class ParseTwoListsRequest(BaseModel):
     base_url: str | None = None
 
 
+class ParsedTwoLists(BaseModel):
+    """Row and column labels extracted by the LLM for a new matrix.
+
+    Validated straight from the model's JSON so parsing, type checks and
+    string coercion happen in one pydantic-core pass. Lists are not capped
+    here; the frontend trims them to 10 and warns when it had to.
+    """
+
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    rows: list[str] = []
+    columns: list[str] = []
+
+
 class Message(BaseModel):
     """Message for conversation context."""
 
@@ -34,6 +61,10 @@ class Message(BaseModel):
     content: str
 
 
+# Dumps a message list to LiteLLM dicts in one pydantic-core call
+_MESSAGES_ADAPTER = TypeAdapter(list[Message])
+
+
 class MatrixFillRequest(BaseModel):
     """Request body for filling a matrix cell."""
 
@@ -46,6 +77,106 @@ class MatrixFillRequest(BaseModel):
     base_url: str | None = None
 
 
+class MatrixFillBatchRequest(BaseModel):
+    """Request body for filling several matrix cells with one LLM call."""
+
+    cells: list[tuple[str, str]]  # (row_item, col_item) pairs
+    context: str  # User-provided matrix context
+    messages: list[Message]  # DAG history for additional context
+    model: str = "openai/gpt-4o-mini"
+    api_key: str | None = None
+    base_url: str | None = None
+
+
+# Static instructions lead the request so providers can cache the prefix; the
+# matrix context and node text go in the user message
+PARSE_TWO_LISTS_SYSTEM_PROMPT = """The user wants to create a matrix/table. They \
+will give you the matrix context and some text.
+
+Extract TWO separate lists from the text as SHORT LABELS for matrix rows and columns.
+
+Rules:
+- Return ONLY a JSON object with "rows" and "columns" arrays, no other text
+- Extract just the NAME or LABEL of each item, not descriptions
+- For example: "GitHub Copilot: $10/month..." -> "GitHub Copilot" (not the full text)
+- Look for two naturally separate categories (e.g., products vs attributes, services vs features)
+- If the text uses "vs" or "versus", split on that: items before "vs" go to rows, items after go to columns
+- If items are comma-separated, split them into individual entries
+- If the text has numbered/bulleted lists, extract the item names from those
+- If only one list is clearly present, put it in "rows" and infer reasonable column headers from the matrix context
+- Maximum 10 items per list - pick the most distinct ones if there are more
+- Keep labels concise (1-5 words typically)
+
+Example 1: "Python, JavaScript vs Speed, Ease of Learning"
+Example 1 output: {"rows": ["Python", "JavaScript"], "columns": ["Speed", "Ease of Learning"]}
+
+Example 2: "1. GitHub Copilot: $10/month... 2. Tabnine: Free tier available..."
+Example 2 output: {"rows": ["GitHub Copilot", "Tabnine"], "columns": ["Price", "Features", "Python Support"]}"""  # noqa: E501
+
+# System prompts for cell fills; only the user-provided context varies
+MATRIX_FILL_SYSTEM_PROMPT = """You are evaluating items in a matrix.
+Matrix context: {context}
+
+You will be given a row item and a column item. Evaluate or analyze the row
+item against the column item. Be concise (2-3 sentences). Focus on the specific
+intersection of these two items. Do not repeat the item names in your response
+- get straight to the evaluation."""
+
+MATRIX_FILL_BATCH_SYSTEM_PROMPT = """You are evaluating items in a matrix.
+Matrix context: {context}
+
+You will be given numbered pairs of a row item and a column item. For each pair,
+evaluate or analyze the row item against the column item. Be concise (2-3
+sentences). Focus on the specific intersection of the two items. Do not repeat
+the item names in your evaluation - get straight to the point.
+
+Output exactly one line of JSON per pair, in order, and nothing else:
+{{"i": <pair number>, "eval": "<evaluation>"}}"""
+
+# Fill bodies carry the DAG history, so parse and validate the raw JSON in one
+# pydantic-core pass rather than json.loads followed by validation
+MatrixFillBody = Annotated[MatrixFillRequest, Depends(json_body(MatrixFillRequest))]
+MatrixFillBatchBody = Annotated[
+    MatrixFillBatchRequest, Depends(json_body(MatrixFillBatchRequest))
+]
+
+# Largest batch accepted by /api/matrix/fill-batch (a full 10x10 matrix)
+MAX_BATCH_CELLS = 100
+
+
+class CellEvaluation(BaseModel):
+    """One JSON line of a batch fill response."""
+
+    # Strict, so "0" is not accepted as a cell index
+    model_config = ConfigDict(strict=True)
+
+    i: int
+    eval: str
+
+
+def parse_cell_line(line: str, num_cells: int) -> dict | None:
+    """Parse one JSON-lines evaluation from a batch fill response.
+
+    Args:
+        line: A single line of LLM output, e.g. '{"i": 0, "eval": "..."}'
+        num_cells: Number of cells in the batch (valid indices are 0..n-1)
+
+    Returns:
+        {"i": int, "eval": str} if the line is a valid evaluation, else None
+    """
+    line = line.strip().rstrip(",")
+    if not line.startswith("{"):
+        return None
+    try:
+        # Parses and type-checks in one pydantic-core pass
+        parsed = CellEvaluation.model_validate_json(line)
+    except ValueError:
+        return None
+    if not 0 <= parsed.i < num_cells:
+        return None
+    return {"i": parsed.i, "eval": parsed.eval.strip()}
+
+
 def register_endpoints(app):
     """Register matrix plugin endpoints with the FastAPI app."""
 
@@ -57,9 +188,10 @@ def register_endpoints(app):
         Returns two lists: one for rows, one for columns (max 10 each).
         """
         from canvas_chat.app import (
-            extract_provider,
-            get_api_key_for_provider,
+            build_system_message,
             inject_admin_credentials,
+            limited_acompletion,
+            litellm,
             prepare_copilot_openai_request,
         )
 
@@ -72,65 +204,43 @@ def register_endpoints(app):
             f"context={request.context[:50]}..."
         )
 
-        provider = extract_provider(request.model)
-
-        system_prompt = f"""The user wants to create a matrix/table for: {request.context}
-
-Extract TWO separate lists from the following text as SHORT LABELS for matrix rows and columns.
-
-Rules:
-- Return ONLY a JSON object with "rows" and "columns" arrays, no other text
-- Extract just the NAME or LABEL of each item, not descriptions
-- For example: "GitHub Copilot: $10/month..." -> "GitHub Copilot" (not the full text)
-- Look for two naturally separate categories (e.g., products vs attributes, services vs features)
-- If the text uses "vs" or "versus", split on that: items before "vs" go to rows, items after go to columns
-- If items are comma-separated, split them into individual entries
-- If the text has numbered/bulleted lists, extract the item names from those
-- If only one list is clearly present, put it in "rows" and infer reasonable column headers from the context  # noqa: E501
-- Maximum 10 items per list - pick the most distinct ones if there are more
-- Keep labels concise (1-5 words typically)
-
-Example 1: "Python, JavaScript vs Speed, Ease of Learning"
-Example 1 output: {{"rows": ["Python", "JavaScript"], "columns": ["Speed", "Ease of Learning"]}}
-
-Example 2: "1. GitHub Copilot: $10/month... 2. Tabnine: Free tier available..."
-Example 2 output: {{"rows": ["GitHub Copilot", "Tabnine"], "columns": ["Price", "Features", "Python Support"]}}"""  # noqa: E501
-
         try:
-            import litellm
-
             kwargs = {
                 "model": request.model,
                 "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": combined_content},
+                    build_system_message(PARSE_TWO_LISTS_SYSTEM_PROMPT, request.model),
+                    {
+                        "role": "user",
+                        "content": (
+                            f"Matrix context: {request.context}\n\n"
+                            f"Text:\n{combined_content}"
+                        ),
+                    },
                 ],
                 "temperature": 0.3,
             }
 
-            api_key = get_api_key_for_provider(provider, request.api_key)
-            if api_key:
-                kwargs["api_key"] = api_key
+            if request.api_key:
+                kwargs["api_key"] = request.api_key
 
             if request.base_url:
                 kwargs["base_url"] = request.base_url
 
-            kwargs = prepare_copilot_openai_request(kwargs, request.model, api_key)
+            kwargs = prepare_copilot_openai_request(
+                kwargs, request.model, request.api_key
+            )
 
-            response = await litellm.acompletion(**kwargs)
+            response = await limited_acompletion(**kwargs)
             title = response.choices[0].message.content.strip()
 
-            title = title.strip("\"'")
+            title = strip_code_fence(title.strip("\"'"))
 
             logger.info(f"Generated title: {title}")
 
             try:
-                parsed = json.loads(title)
-                return {
-                    "rows": parsed.get("rows", []),
-                    "columns": parsed.get("columns", []),
-                }
-            except json.JSONDecodeError:
+                # Raises ValidationError (a ValueError) on malformed or odd JSON
+                return ParsedTwoLists.model_validate_json(title).model_dump()
+            except ValueError:
                 rows_match = re.search(r'"rows"\s*:\s*\[([^\]]*)\]', title)
                 cols_match = re.search(r'"columns"\s*:\s*\[([^\]]*)\]', title)
 
@@ -153,22 +263,28 @@ Example 2 output: {{"rows": ["GitHub Copilot", "Tabnine"], "columns": ["Price",
 
                 return {"rows": rows, "columns": cols}
 
+        except litellm.RateLimitError as e:
+            raise HTTPException(
+                status_code=429,
+                detail="Rate limit exceeded. Please try again later.",
+            ) from e
         except Exception as e:
-            logger.error(f"Generate title failed: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Generate title failed: {e}")
             raise HTTPException(status_code=500, detail=str(e)) from e
 
     @app.post("/api/matrix/fill")
-    async def matrix_fill(request: MatrixFillRequest):
+    async def matrix_fill(request: MatrixFillBody):
         """
         Fill a single matrix cell by evaluating row item against column item.
 
         Returns SSE stream with the evaluation content.
         """
         from canvas_chat.app import (
-            extract_provider,
-            get_api_key_for_provider,
+            coalesce_deltas,
+            encode_message_event,
             inject_admin_credentials,
+            iter_content_deltas,
+            limited_acompletion,
             prepare_copilot_openai_request,
         )
 
@@ -179,63 +295,131 @@ Example 2 output: {{"rows": ["GitHub Copilot", "Tabnine"], "columns": ["Price",
             f"col_item={request.col_item[:50]}..."
         )
 
-        provider = extract_provider(request.model)
+        system_prompt = MATRIX_FILL_SYSTEM_PROMPT.format(context=request.context)
+        messages = [{"role": "system", "content": system_prompt}]
+        messages.extend(_MESSAGES_ADAPTER.dump_python(request.messages))
+        messages.append(
+            {
+                "role": "user",
+                "content": (
+                    f"Row item: {request.row_item}\nColumn item: {request.col_item}"
+                ),
+            }
+        )
+
+        kwargs = {
+            "model": request.model,
+            "messages": messages,
+            "temperature": 0.5,
+            "stream": True,
+        }
+
+        if request.api_key:
+            kwargs["api_key"] = request.api_key
+
+        if request.base_url:
+            kwargs["base_url"] = request.base_url
+
+        kwargs = prepare_copilot_openai_request(kwargs, request.model, request.api_key)
 
         async def generate():
             try:
-                import litellm
+                response = await limited_acompletion(**kwargs)
 
-                system_prompt = f"""You are evaluating items in a matrix.
-Matrix context: {request.context}
+                # Coalesce tokens so each SSE event carries several of them
+                async for content in coalesce_deltas(iter_content_deltas(response)):
+                    yield encode_message_event(content)
 
-You will be given a row item and a column item. Evaluate or analyze the row
-item against the column item. Be concise (2-3 sentences). Focus on the specific
-intersection of these two items. Do not repeat the item names in your response
-- get straight to the evaluation."""
+                yield {"event": "done", "data": ""}
+
+            except Exception as e:
+                logger.exception(f"Matrix fill error: {e}")
+                yield {"event": "error", "data": str(e)}
 
-                messages = [{"role": "system", "content": system_prompt}]
+        return EventSourceResponse(generate())
 
-                for msg in request.messages:
-                    messages.append({"role": msg.role, "content": msg.content})
+    @app.post("/api/matrix/fill-batch")
+    async def matrix_fill_batch(request: MatrixFillBatchBody):
+        """
+        Fill several matrix cells with a single LLM request.
 
-                messages.append(
-                    {
-                        "role": "user",
-                        "content": (
-                            f"Row item: {request.row_item}\n"
-                            f"Column item: {request.col_item}"
-                        ),
-                    }
-                )
+        The system prompt and DAG history are sent once for the whole batch
+        instead of once per cell. The model answers in JSON lines, and each
+        cell is streamed back as a "cell" SSE event ({"i": index, "eval": text})
+        as soon as its line is complete.
+        """
+        from canvas_chat.app import (
+            inject_admin_credentials,
+            iter_content_deltas,
+            limited_acompletion,
+            prepare_copilot_openai_request,
+        )
+
+        if not request.cells:
+            raise HTTPException(status_code=400, detail="No cells provided")
+        if len(request.cells) > MAX_BATCH_CELLS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Maximum {MAX_BATCH_CELLS} cells per batch",
+            )
+
+        inject_admin_credentials(request)
 
-                kwargs = {
-                    "model": request.model,
-                    "messages": messages,
-                    "temperature": 0.5,
-                    "stream": True,
-                }
+        num_cells = len(request.cells)
+        logger.info(f"Matrix fill batch request: {num_cells} cells")
 
-                api_key = get_api_key_for_provider(provider, request.api_key)
-                if api_key:
-                    kwargs["api_key"] = api_key
+        system_prompt = MATRIX_FILL_BATCH_SYSTEM_PROMPT.format(context=request.context)
+        pairs = "\n".join(
+            f"{i}. Row item: {row_item} | Column item: {col_item}"
+            for i, (row_item, col_item) in enumerate(request.cells)
+        )
 
-                if request.base_url:
-                    kwargs["base_url"] = request.base_url
+        messages = [{"role": "system", "content": system_prompt}]
+        messages.extend(_MESSAGES_ADAPTER.dump_python(request.messages))
+        messages.append({"role": "user", "content": pairs})
 
-                kwargs = prepare_copilot_openai_request(kwargs, request.model, api_key)
+        kwargs = {
+            "model": request.model,
+            "messages": messages,
+            "temperature": 0.5,
+            "stream": True,
+        }
 
-                response = await litellm.acompletion(**kwargs)
+        if request.api_key:
+            kwargs["api_key"] = request.api_key
 
-                async for chunk in response:
-                    if chunk.choices and chunk.choices[0].delta.content:
-                        content = chunk.choices[0].delta.content
-                        yield {"event": "message", "data": content}
+        if request.base_url:
+            kwargs["base_url"] = request.base_url
 
-                yield {"event": "done", "data": ""}
+        kwargs = prepare_copilot_openai_request(kwargs, request.model, request.api_key)
+
+        async def generate():
+            try:
+                response = await limited_acompletion(**kwargs)
+
+                # Emit each cell as soon as its JSON line is complete
+                pending = ""
+                async for content in iter_content_deltas(response):
+                    pending += content
+                    # Most deltas are mid-line; only split once a line ends
+                    if "\n" not in content:
+                        continue
+                    *lines, pending = pending.split("\n")
+                    for line in lines:
+                        cell = parse_cell_line(line, num_cells)
+                        if cell is not None:
+                            yield ServerSentEvent(
+                                data=to_json(cell).decode(), event="cell"
+                            )
+
+                cell = parse_cell_line(pending, num_cells)
+                if cell is not None:
+                    yield ServerSentEvent(data=to_json(cell).decode(), event="cell")
+
+                yield ServerSentEvent(data="", event="done")
 
             except Exception as e:
-                logger.error(f"Matrix fill error: {e}")
-                logger.error(traceback.format_exc())
-                yield {"event": "error", "data": str(e)}
+                logger.exception(f"Matrix fill batch error: {e}")
+                yield ServerSentEvent(data=str(e), event="error")
 
         return EventSourceResponse(generate())
@@ -3,6 +3,7 @@
 Handles PDF file uploads and text extraction on the backend.
 """
 
+import asyncio
 import logging
 
 import pymupdf
@@ -47,8 +48,11 @@ class PdfFileUploadHandler(FileUploadHandlerPlugin):
         # Validate file size
         self.validate_file_size(file_bytes, MAX_PDF_SIZE, "PDF")
 
-        # Extract text from PDF
-        text, page_count = self.extract_text_from_pdf(file_bytes)
+        # Extract text in a worker thread; large PDFs take long enough to parse
+        # that running it on the event loop would stall concurrent streams
+        text, page_count = await asyncio.to_thread(
+            self.extract_text_from_pdf, file_bytes
+        )
         content = PDF_WARNING_BANNER + text
 
         # Extract title from filename (remove extension)
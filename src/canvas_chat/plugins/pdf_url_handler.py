@@ -3,6 +3,7 @@
 Handles PDF URL fetching by downloading and extracting text content.
 """
 
+import asyncio
 import logging
 from typing import Any
 
@@ -93,8 +94,10 @@ class PdfUrlHandler(UrlFetchHandlerPlugin):
                 raise
             raise ValueError(f"Failed to fetch PDF: {str(e)}") from e
 
-        # Extract text from PDF
-        text, page_count = self._extract_text_from_pdf(pdf_bytes)
+        # Extract text in a worker thread so parsing does not block the event loop
+        text, page_count = await asyncio.to_thread(
+            self._extract_text_from_pdf, pdf_bytes
+        )
         content = PDF_WARNING_BANNER + text
 
         # Extract title from filename (remove extension)
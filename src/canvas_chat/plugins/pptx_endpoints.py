@@ -12,7 +12,6 @@ from __future__ import annotations
 
 import json
 import logging
-import traceback
 from typing import Any
 
 from pydantic import BaseModel, Field
@@ -203,7 +202,7 @@ def register_endpoints(app) -> None:
     @app.post("/api/pptx/caption-title-slide")
     async def pptx_caption_title_slide(request: PptxSlideCaptionTitleRequest):
         """Generate a slide title + one-paragraph caption (text-only)."""
-        from canvas_chat.app import inject_admin_credentials
+        from canvas_chat.app import inject_admin_credentials, litellm
 
         inject_admin_credentials(request)
 
@@ -230,7 +229,7 @@ Rules:
         try:
             from canvas_chat.app import (
                 _llm_text,
-                litellm,
+                limited_acompletion,
                 prepare_copilot_openai_request,
             )
 
@@ -258,7 +257,7 @@ Rules:
 
             if supports_structured:
                 kwargs["response_format"] = SlideCaptionTitleOutput
-                response = await litellm.acompletion(**kwargs)
+                response = await limited_acompletion(**kwargs)
                 content = response.choices[0].message.content
                 if isinstance(content, str):
                     parsed = _extract_json_object(content)
@@ -288,15 +287,19 @@ Rules:
             return {"title": out.title, "caption": out.caption}
         except HTTPException:
             raise
+        except litellm.RateLimitError as e:
+            raise HTTPException(
+                status_code=429,
+                detail="Rate limit exceeded. Please try again later.",
+            ) from e
         except Exception as e:
-            logger.error(f"PPTX slide caption/title failed: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"PPTX slide caption/title failed: {e}")
             raise HTTPException(status_code=500, detail=str(e)) from e
 
     @app.post("/api/pptx/caption-title-deck")
     async def pptx_caption_title_deck(request: PptxDeckCaptionTitleRequest):
         """Generate titles + one-paragraph captions for all slides (single call)."""
-        from canvas_chat.app import inject_admin_credentials
+        from canvas_chat.app import inject_admin_credentials, litellm
 
         inject_admin_credentials(request)
 
@@ -340,7 +343,7 @@ Rules:
         try:
             from canvas_chat.app import (
                 _llm_text,
-                litellm,
+                limited_acompletion,
                 prepare_copilot_openai_request,
             )
 
@@ -368,7 +371,7 @@ Rules:
 
             if supports_structured:
                 kwargs["response_format"] = DeckCaptionTitleOutput
-                response = await litellm.acompletion(**kwargs)
+                response = await limited_acompletion(**kwargs)
                 content = response.choices[0].message.content
                 if isinstance(content, str):
                     out = DeckCaptionTitleOutput.model_validate(
@@ -413,9 +416,13 @@ Rules:
             return {"slides": normalized}
         except HTTPException:
             raise
+        except litellm.RateLimitError as e:
+            raise HTTPException(
+                status_code=429,
+                detail="Rate limit exceeded. Please try again later.",
+            ) from e
         except Exception as e:
-            logger.error(f"PPTX deck caption/title failed: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"PPTX deck caption/title failed: {e}")
             raise HTTPException(status_code=500, detail=str(e)) from e
 
     @app.post("/api/pptx/narrative-style-suggestions")
@@ -468,6 +475,7 @@ Rules:
         try:
             from canvas_chat.app import (
                 _llm_text,
+                limited_acompletion,
                 litellm,
                 prepare_copilot_openai_request,
             )
@@ -496,7 +504,7 @@ Rules:
 
             if supports_structured:
                 kwargs["response_format"] = NarrativeStyleSuggestionsOutput
-                response = await litellm.acompletion(**kwargs)
+                response = await limited_acompletion(**kwargs)
                 content = response.choices[0].message.content
                 if isinstance(content, str):
                     out = NarrativeStyleSuggestionsOutput.model_validate(
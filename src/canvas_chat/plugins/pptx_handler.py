@@ -11,6 +11,7 @@ Pipeline:
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import logging
 import os
@@ -394,7 +395,10 @@ class PptxFileUploadHandler(FileUploadHandlerPlugin):
             pptx_path.write_bytes(file_bytes)
 
             render_dir = workdir / "rendered"
-            png_paths, rendering_mode = _render_pptx_to_pngs(
+            # LibreOffice conversion and page rendering take seconds; run them in
+            # a worker thread so other requests keep being served meanwhile
+            png_paths, rendering_mode = await asyncio.to_thread(
+                _render_pptx_to_pngs,
                 pptx_path,
                 out_dir=render_dir,
                 timeout_s=LIBREOFFICE_TIMEOUT_S,
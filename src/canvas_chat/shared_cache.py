@@ -0,0 +1,76 @@
+"""Optional Redis-backed response cache shared across workers.
+
+The in-process TTLCache in canvas_chat.cache is per worker and lost on restart.
+When ``CANVAS_CHAT_REDIS_URL`` is set and the ``redis`` package is installed,
+selected LLM responses are also stored in Redis, so other workers and restarted
+servers can reuse them.
+
+Redis is a cache here, never a source of truth: connection or command errors
+are logged and treated as a miss.
+"""
+
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "canvas-chat:"
+
+
+class SharedCache:
+    """String cache on top of an async Redis client.
+
+    Args:
+        client: A ``redis.asyncio.Redis`` client (or anything with the same
+            ``get``/``set``/``aclose`` coroutines)
+        prefix: Namespace prepended to every key
+    """
+
+    def __init__(self, client: Any, prefix: str = KEY_PREFIX):
+        self._client = client
+        self._prefix = prefix
+
+    async def get(self, key: str) -> str | None:
+        """Return the cached value for key, or None on a miss or Redis error."""
+        try:
+            value = await self._client.get(self._prefix + key)
+        except Exception as e:
+            logger.warning("Shared cache read failed: %s", e)
+            return None
+        if isinstance(value, bytes):
+            return value.decode("utf-8")
+        return value
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        """Store value under key for ttl seconds, ignoring Redis errors."""
+        try:
+            await self._client.set(self._prefix + key, value, ex=ttl)
+        except Exception as e:
+            logger.warning("Shared cache write failed: %s", e)
+
+    async def aclose(self) -> None:
+        """Close the underlying Redis connection pool."""
+        await self._client.aclose()
+
+
+def create_shared_cache(url: str | None) -> SharedCache | None:
+    """Connect a SharedCache to the Redis server at url.
+
+    Args:
+        url: Redis URL such as ``redis://localhost:6379/0``; empty disables
+            the shared cache
+
+    Returns:
+        The shared cache, or None if no URL is set or redis is not installed
+    """
+    if not url:
+        return None
+    try:
+        import redis.asyncio as aioredis
+    except ImportError:
+        logger.warning(
+            "CANVAS_CHAT_REDIS_URL is set but the redis package is not installed; "
+            "install canvas-chat[redis] to enable the shared cache"
+        )
+        return None
+    return SharedCache(aioredis.from_url(url))
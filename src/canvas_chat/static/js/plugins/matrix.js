@@ -21,7 +21,7 @@ import {
 import { BaseNode, HeaderButtons, wrapNode } from '../node-protocols.js';
 import { NodeRegistry } from '../node-registry.js';
 import { CancellableEvent } from '../plugin-events.js';
-import { streamSSEContent } from '../sse.js';
+import { readSSEStream, streamSSEContent } from '../sse.js';
 import { apiUrl, buildMessagesForApi, escapeHtmlText } from '../utils.js';
 
 // =============================================================================
@@ -540,6 +540,9 @@ export { MatrixNode };
 // Matrix Feature Plugin
 // =============================================================================
 
+// Cells per /api/matrix/fill-batch request (MAX_BATCH_CELLS in matrix_handler.py)
+const MATRIX_FILL_BATCH_SIZE = 100;
+
 /**
  * MatrixFeature - Encapsulates all matrix-related functionality.
  * Extends FeaturePlugin to integrate with the plugin architecture.
@@ -1589,6 +1592,15 @@ class MatrixFeature extends FeaturePlugin {
             return;
         }
 
+        // Without a prompt hook every cell uses the default prompt, so one batch
+        // request can fill them all; the hook needs per-cell requests.
+        if (!this.hasCellPromptHook()) {
+            for (let i = 0; i < emptyCells.length; i += MATRIX_FILL_BATCH_SIZE) {
+                await this.handleMatrixFillBatch(nodeId, emptyCells.slice(i, i + MATRIX_FILL_BATCH_SIZE));
+            }
+            return;
+        }
+
         // Fill all cells in parallel - each cell handles its own tracking/cleanup
         const fillPromises = emptyCells.map(({ row, col }) => {
             return this.handleMatrixCellFill(nodeId, row, col).catch((err) => {
@@ -1601,6 +1613,160 @@ class MatrixFeature extends FeaturePlugin {
         await Promise.all(fillPromises);
     }
 
+    /**
+     * Whether a plugin customizes per-cell prompts via matrix:cell:prompt.
+     * @returns {boolean}
+     */
+    hasCellPromptHook() {
+        const eventBus = this.featureRegistry?.getEventBus?.();
+        return eventBus ? eventBus.listenerCount('matrix:cell:prompt') > 0 : false;
+    }
+
+    /**
+     * Fill several matrix cells with one /api/matrix/fill-batch request.
+     * The system prompt and DAG history are sent once for the whole batch, and
+     * each cell is written as soon as its "cell" event arrives. Cells the batch
+     * does not answer (or all of them, if the request fails) fall back to
+     * individual fills.
+     * @param {string} nodeId - Matrix node ID
+     * @param {Array<{row: number, col: number}>} cellPositions - Cells to fill
+     */
+    async handleMatrixFillBatch(nodeId, cellPositions) {
+        const matrixNode = this.graph.getNode(nodeId);
+        if (!matrixNode || matrixNode.type !== NodeType.MATRIX) return;
+
+        const { rowItems, colItems, context } = matrixNode;
+        const groupId = `matrix-${nodeId}`;
+        const messages = this.graph.resolveContext([nodeId]);
+        const abortController = new AbortController();
+
+        // Same per-cell guard and before-fill hook as a single cell fill
+        const pending = [];
+        for (const { row, col } of cellPositions) {
+            const cellKey = `${row}-${col}`;
+            const cellNodeId = `${nodeId}:cell:${cellKey}`;
+            if (this.streamingManager.getGroupNodes(groupId).has(cellNodeId)) continue;
+
+            const rowItem = rowItems[row];
+            const colItem = colItems[col];
+            const beforeEvent = new CancellableEvent('matrix:before:fill', {
+                nodeId,
+                row,
+                col,
+                rowItem,
+                colItem,
+                context,
+                messages,
+            });
+            this.emit('matrix:before:fill', beforeEvent);
+            if (beforeEvent.defaultPrevented) continue;
+
+            this.streamingManager.register(cellNodeId, {
+                abortController,
+                featureId: 'matrix',
+                groupId,
+                context: { nodeId, row, col, rowItem, colItem },
+                showStopButton: false, // We manage the button on parent matrix node manually
+                onStop: () => {
+                    console.log(`[MatrixFeature] Cell fill stopped: ${cellKey}`);
+                },
+            });
+            pending.push({ row, col, rowItem, colItem, cellKey, cellNodeId, done: false });
+        }
+        if (pending.length === 0) return;
+        this.canvas.showStopButton(nodeId);
+
+        const finishCell = (cell) => {
+            cell.done = true;
+            this.streamingManager.unregister(cell.cellNodeId, { hideButtons: false });
+        };
+
+        let unanswered = [];
+        try {
+            const requestBody = this.buildLLMRequest({
+                cells: pending.map((cell) => [cell.rowItem, cell.colItem]),
+                context,
+                messages: buildMessagesForApi(messages),
+            });
+            const response = await fetch(apiUrl('/api/matrix/fill-batch'), {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(requestBody),
+                signal: abortController.signal,
+            });
+            if (!response.ok) {
+                throw new Error(`Failed to fill cells: ${response.statusText}`);
+            }
+
+            const wrapped = wrapNode(matrixNode);
+            await readSSEStream(response, {
+                onEvent: (eventType, data) => {
+                    if (eventType !== 'cell') return;
+                    const { i, eval: content } = JSON.parse(data);
+                    const cell = pending[i];
+                    if (!cell || cell.done) return;
+
+                    wrapped.updateCellContent(nodeId, cell.cellKey, content, false, this.canvas);
+                    // Re-read node so cells filled meanwhile are not overwritten
+                    const currentCells = this.graph.getNode(nodeId)?.cells || {};
+                    const oldCell = currentCells[cell.cellKey]
+                        ? { ...currentCells[cell.cellKey] }
+                        : { content: null, filled: false };
+                    const newCell = { content, filled: true };
+                    this.graph.updateNode(nodeId, { cells: { ...currentCells, [cell.cellKey]: newCell } });
+                    this.undoManager.push({
+                        type: 'FILL_CELL',
+                        nodeId,
+                        row: cell.row,
+                        col: cell.col,
+                        oldCell,
+                        newCell,
+                    });
+                    finishCell(cell);
+
+                    this.emit('matrix:after:fill', {
+                        nodeId,
+                        row: cell.row,
+                        col: cell.col,
+                        rowItem: cell.rowItem,
+                        colItem: cell.colItem,
+                        content,
+                        success: true,
+                    });
+                },
+                onError: (err) => {
+                    throw err;
+                },
+            });
+            this.saveSession();
+            unanswered = pending.filter((cell) => !cell.done);
+        } catch (err) {
+            if (err.name === 'AbortError') {
+                console.log('Batch cell fill aborted');
+            } else {
+                console.error('Batch matrix fill failed, filling cells individually:', err);
+                unanswered = pending.filter((cell) => !cell.done);
+            }
+        } finally {
+            for (const cell of pending) {
+                if (!cell.done) finishCell(cell);
+            }
+            if (this.streamingManager.getGroupNodes(groupId).size === 0) {
+                this.canvas.hideStopButton(nodeId);
+            }
+        }
+
+        await Promise.all(
+            unanswered.map(({ row, col }) =>
+                this.handleMatrixCellFill(nodeId, row, col).catch((err) => {
+                    if (err.name !== 'AbortError') {
+                        console.error(`Failed to fill cell (${row}, ${col}):`, err);
+                    }
+                })
+            )
+        );
+    }
+
     /**
      * Clear all filled cells in a matrix.
      * @param {string} nodeId - Matrix node ID
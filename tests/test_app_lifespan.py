@@ -0,0 +1,146 @@
+"""Tests for the app lifespan (shared LiteLLM HTTP client)."""
+
+import asyncio
+
+import httpx
+import litellm
+from fastapi.testclient import TestClient
+
+import canvas_chat.app as app_module
+from canvas_chat.app import app
+from canvas_chat.cache import TTLCache
+from canvas_chat.config import AppConfig, ModelConfig
+
+
+def test_lifespan_shares_one_http_client_with_litellm():
+    """LiteLLM should use one pooled client while the app runs, then release it."""
+    with TestClient(app):
+        client = litellm.aclient_session
+        assert client is not None
+        assert not client.is_closed
+
+    assert litellm.aclient_session is None
+    assert client.is_closed
+
+
+def test_local_http_client_is_reused_until_shutdown():
+    """Ollama polling should reuse one client, which is closed on shutdown."""
+    with TestClient(app):
+        client = app_module.get_local_http_client()
+        assert app_module.get_local_http_client() is client
+
+    assert client.is_closed
+    assert app_module.get_local_http_client() is not client
+
+
+def test_provider_http_client_is_reused_until_shutdown():
+    """Provider API calls should share one client, which is closed on shutdown."""
+    with TestClient(app):
+        client = app_module.get_provider_http_client()
+        assert app_module.get_provider_http_client() is client
+
+    assert client.is_closed
+
+
+def test_llm_http_client_follows_litellm_transport_choice(monkeypatch):
+    """The shared client should use aiohttp unless LiteLLM's switch disables it."""
+    from litellm.llms.custom_httpx.aiohttp_transport import LiteLLMAiohttpTransport
+
+    monkeypatch.setattr(litellm, "disable_aiohttp_transport", False)
+    client = app_module.create_llm_http_client()
+    assert isinstance(client._transport, LiteLLMAiohttpTransport)
+
+    monkeypatch.setattr(litellm, "disable_aiohttp_transport", True)
+    client = app_module.create_llm_http_client()
+    assert isinstance(client._transport, httpx.AsyncHTTPTransport)
+
+
+def test_llm_http_client_falls_back_when_litellm_helpers_change(monkeypatch):
+    """Missing or broken private LiteLLM helpers should not break startup."""
+    from litellm.llms.custom_httpx.http_handler import AsyncHTTPHandler
+
+    monkeypatch.setattr(litellm, "disable_aiohttp_transport", False)
+    monkeypatch.delattr(AsyncHTTPHandler, "_create_async_transport")
+    client = app_module.create_llm_http_client()
+    assert isinstance(client._transport, httpx.AsyncHTTPTransport)
+
+    def broken_should_use(*args):
+        raise TypeError("signature changed")
+
+    monkeypatch.setattr(
+        AsyncHTTPHandler,
+        "_should_use_aiohttp_transport",
+        staticmethod(broken_should_use),
+    )
+    client = app_module.create_llm_http_client()
+    assert isinstance(client._transport, httpx.AsyncHTTPTransport)
+
+
+def test_warm_up_primes_admin_models_only_when_enabled(monkeypatch):
+    """Billed warm-up requests should be sent only when explicitly enabled."""
+    calls = []
+
+    async def fake_acompletion(**kwargs):
+        calls.append(kwargs)
+        raise litellm.AuthenticationError("bad key", "openai", "openai/gpt-4o")
+
+    config = AppConfig(
+        models=[ModelConfig(id="openai/gpt-4o", name="GPT-4o")], admin_mode=True
+    )
+    monkeypatch.setattr(app_module, "get_admin_config", lambda: config)
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion)
+
+    monkeypatch.delenv("CANVAS_CHAT_WARMUP_LLM", raising=False)
+    asyncio.run(app_module.warm_up_llm())
+    assert calls == []
+
+    monkeypatch.setenv("CANVAS_CHAT_WARMUP_LLM", "true")
+    asyncio.run(app_module.warm_up_llm())
+    assert [call["model"] for call in calls] == ["openai/gpt-4o"]
+    assert calls[0]["max_tokens"] == 1
+
+
+def test_lifespan_discovers_ollama_models_at_startup(monkeypatch):
+    """Ollama models should be fetched on startup, before any /api/models call."""
+    models = [{"id": "ollama_chat/llama3", "name": "llama3", "provider": "Ollama"}]
+
+    async def fake_request_ollama_models():
+        return models
+
+    async def wait_for_refresh():
+        await app_module._ollama_refresh_task
+
+    monkeypatch.setattr(app_module, "request_ollama_models", fake_request_ollama_models)
+    monkeypatch.setattr(app_module, "_ollama_models_cache", TTLCache(maxsize=1, ttl=30))
+    monkeypatch.setattr(app_module, "_ollama_models_stale", None)
+    monkeypatch.setattr(app_module, "_ollama_refresh_task", None)
+
+    with TestClient(app) as client:
+        client.portal.call(wait_for_refresh)
+        assert app_module._ollama_models_stale == models
+
+
+def test_shutdown_does_not_create_unused_local_client(monkeypatch):
+    """Shutdown should not build a local client only to close it."""
+
+    async def fake_request_ollama_models():
+        return []
+
+    monkeypatch.setattr(app_module, "request_ollama_models", fake_request_ollama_models)
+    monkeypatch.setattr(app_module, "_ollama_refresh_task", None)
+    monkeypatch.setattr(app_module, "_local_http_client", None)
+
+    with TestClient(app):
+        pass
+
+    assert app_module._local_http_client is None
+
+
+def test_shutdown_does_not_create_unused_provider_client(monkeypatch):
+    """A server that never called a provider API should not create its client."""
+    monkeypatch.setattr(app_module, "_provider_http_client", None)
+
+    with TestClient(app):
+        pass
+
+    assert app_module._provider_http_client is None
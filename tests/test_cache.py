@@ -0,0 +1,51 @@
+"""Unit tests for the in-process TTL cache."""
+
+import canvas_chat.cache as cache_module
+from canvas_chat.cache import TTLCache, make_cache_key
+
+
+def test_make_cache_key_is_order_independent():
+    """Dict key order should not change the cache key."""
+    assert make_cache_key({"a": 1, "b": [1, 2]}) == make_cache_key(
+        {"b": [1, 2], "a": 1}
+    )
+    assert make_cache_key({"a": 1}) != make_cache_key({"a": 2})
+
+
+def test_ttl_cache_get_and_set():
+    """Stored values should be returned until they expire."""
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set("key", "value")
+
+    assert cache.get("key") == "value"
+    assert "key" in cache
+    assert cache.get("missing") is None
+    assert cache.get("missing", "default") == "default"
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    """Entries older than the TTL should be dropped."""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.set("key", "value")
+
+    now[0] += 9
+    assert cache.get("key") == "value"
+
+    now[0] += 2
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """The least recently used entry should be evicted when full."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
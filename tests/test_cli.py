@@ -0,0 +1,46 @@
+"""Tests for the canvas-chat command line entry point."""
+
+import os
+import subprocess
+import sys
+
+from typer.testing import CliRunner
+
+import canvas_chat.__main__ as cli
+
+
+def test_importing_package_leaves_environment_alone():
+    """Library users and tests should not have their environment changed."""
+    env = {k: v for k, v in os.environ.items() if k != "LITELLM_LOCAL_MODEL_COST_MAP"}
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import os, canvas_chat; "
+            "print(os.environ.get('LITELLM_LOCAL_MODEL_COST_MAP'))",
+        ],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == "None"
+
+
+def test_launch_defaults_to_bundled_model_cost_map(monkeypatch):
+    """The server should use LiteLLM's bundled cost map unless told otherwise."""
+    runs = []
+    monkeypatch.delenv("LITELLM_LOCAL_MODEL_COST_MAP", raising=False)
+    monkeypatch.setattr(
+        cli.uvicorn,
+        "run",
+        lambda *args, **kwargs: runs.append(
+            os.environ.get("LITELLM_LOCAL_MODEL_COST_MAP")
+        ),
+    )
+
+    result = CliRunner().invoke(cli.app, ["launch", "--no-browser"])
+
+    assert result.exit_code == 0, result.output
+    assert runs == ["true"]
@@ -0,0 +1,63 @@
+"""Tests for /api/committee endpoint."""
+
+import json
+from types import SimpleNamespace
+
+import litellm
+from fastapi.testclient import TestClient
+
+from canvas_chat.app import app
+
+
+def parse_events(body: str) -> list[tuple[str, str]]:
+    """Split an SSE body into (event, data) pairs."""
+    events = []
+    for block in body.replace("\r\n", "\n").split("\n\n"):
+        fields = dict(
+            line.split(": ", 1) for line in block.splitlines() if ": " in line
+        )
+        if "event" in fields:
+            events.append((fields["event"], fields.get("data", "")))
+    return events
+
+
+def test_committee_streams_opinions_and_synthesis(monkeypatch):
+    """Opinion and synthesis chunks should stream as JSON payloads."""
+
+    def chunk(content):
+        delta = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def fake_acompletion(**kwargs):
+        async def stream():
+            yield chunk(f"{kwargs['model']} says hi")
+
+        return stream()
+
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion)
+
+    response = TestClient(app).post(
+        "/api/committee",
+        json={
+            "question": "Why?",
+            "context": [{"role": "user", "content": "Hello"}],
+            "models": ["openai/gpt-4o", "openai/gpt-4o-mini"],
+            "chairman_model": "openai/gpt-4o",
+            "api_keys": {"openai": "sk-test"},
+        },
+    )
+
+    events = parse_events(response.text)
+    names = [name for name, _ in events]
+    assert names.count("opinion_done") == 2
+    assert names[-2:] == ["synthesis_done", "done"]
+
+    chunks = [json.loads(data) for name, data in events if name == "opinion_chunk"]
+    assert {c["content"] for c in chunks} == {
+        "openai/gpt-4o says hi",
+        "openai/gpt-4o-mini says hi",
+    }
+    # Every committee payload goes through the same compact JSON encoder
+    assert events[-2][1] == '{"full_content":"openai/gpt-4o says hi"}'
+    start = next(data for name, data in events if name == "synthesis_start")
+    assert start == '{"model":"openai/gpt-4o"}'
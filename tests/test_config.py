@@ -1,8 +1,10 @@
 """Unit tests for AppConfig - no API calls required."""
 
+import os
+
 import pytest
 
-from canvas_chat.config import AppConfig, ModelConfig
+from canvas_chat.config import AppConfig, ModelConfig, _read_config_file
 
 # --- ModelConfig.from_dict tests ---
 
@@ -132,6 +134,24 @@ def test_admin_config_load_empty_models_list(tmp_path):
         AppConfig.load(config_file, admin_mode=True)
 
 
+def test_admin_config_load_reparses_only_when_file_changes(tmp_path):
+    """Repeat loads reuse the parsed file until it is modified."""
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text('models:\n  - id: "openai/gpt-4o"\n')
+    _read_config_file.cache_clear()
+
+    AppConfig.load(config_file)
+    AppConfig.load(config_file)
+    assert _read_config_file.cache_info().misses == 1
+
+    config_file.write_text('models:\n  - id: "openai/gpt-4o-mini"\n')
+    stat = config_file.stat()
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    config = AppConfig.load(config_file)
+    assert config.models[0].id == "openai/gpt-4o-mini"
+
+
 # --- AppConfig.disabled tests ---
 
 
@@ -245,6 +265,22 @@ models:
     assert model is None
 
 
+def test_admin_config_get_model_config_prefers_first_duplicate(tmp_path):
+    """A model ID listed twice should resolve to its first entry."""
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("""
+models:
+  - id: "openai/gpt-4o"
+    name: "First"
+  - id: "openai/gpt-4o"
+    name: "Second"
+""")
+
+    config = AppConfig.load(config_file)
+
+    assert config.get_model_config("openai/gpt-4o").name == "First"
+
+
 # --- AppConfig.resolve_credentials tests ---
 
 
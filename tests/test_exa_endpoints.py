@@ -0,0 +1,83 @@
+"""Tests for /api/exa/search and /api/exa/research endpoints."""
+
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+import canvas_chat.app as app_module
+from canvas_chat.app import app
+from canvas_chat.cache import TTLCache
+
+
+class FakeResearch:
+    """Stand-in for AsyncExa.research that replays a fixed event stream."""
+
+    def __init__(self, events):
+        self.events = events
+
+    async def create(self, instructions, model):
+        return SimpleNamespace(research_id="r-1")
+
+    async def get(self, research_id, stream):
+        async def iterate():
+            for event in self.events:
+                yield event
+
+        return iterate()
+
+
+def test_exa_research_streams_only_populated_fields(monkeypatch):
+    """Events should emit status and sources only when they are set."""
+    events = [
+        SimpleNamespace(status="running"),
+        SimpleNamespace(status=None, sources=[]),
+        SimpleNamespace(sources=[SimpleNamespace(title="Doc", url="https://a.b")]),
+    ]
+    client_stub = SimpleNamespace(research=FakeResearch(events))
+    monkeypatch.setattr(app_module, "get_exa_client", lambda api_key: client_stub)
+
+    response = TestClient(app).post(
+        "/api/exa/research",
+        json={"instructions": "Find things", "api_key": "exa-test"},
+    )
+
+    body = response.text
+    assert body.count("event: status") == 2
+    assert "data: running" in body
+    assert 'data: [{"title":"Doc","url":"https://a.b"}]' in body
+    assert "event: done" in body
+    assert "event: error" not in body
+
+
+def test_exa_search_reuses_cached_results(monkeypatch):
+    """Identical searches should only call Exa once."""
+    calls = []
+
+    async def search_and_contents(query, **kwargs):
+        calls.append(query)
+        result = SimpleNamespace(
+            title="Doc",
+            url="https://a.b",
+            text="Body",
+            published_date=None,
+            author=None,
+        )
+        return SimpleNamespace(results=[result])
+
+    client_stub = SimpleNamespace(search_and_contents=search_and_contents)
+    monkeypatch.setattr(app_module, "get_exa_client", lambda api_key: client_stub)
+    monkeypatch.setattr(app_module, "_exa_search_cache", TTLCache())
+
+    client = TestClient(app)
+    payload = {"query": "canvas chat", "api_key": "exa-test"}
+    first = client.post("/api/exa/search", json=payload)
+    second = client.post("/api/exa/search", json=payload)
+    other = client.post("/api/exa/search", json={**payload, "num_results": 3})
+    other_key = client.post("/api/exa/search", json={**payload, "api_key": "exa-2"})
+
+    assert first.json() == second.json()
+    assert first.json()["results"][0]["url"] == "https://a.b"
+    assert other.status_code == 200
+    assert other_key.status_code == 200
+    # A different key never reuses results another key paid for
+    assert len(calls) == 3
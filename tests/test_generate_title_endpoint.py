@@ -3,7 +3,10 @@
 Guards against regression where endpoint was removed between v0.1.62 and v0.1.63.
 """
 
-from canvas_chat.app import GenerateTitleRequest
+import litellm
+from fastapi.testclient import TestClient
+
+from canvas_chat.app import GenerateTitleRequest, app
 
 
 class TestGenerateTitleRequest:
@@ -68,3 +71,18 @@ class TestGenerateTitleRequest:
         assert request.model == "anthropic/claude-3-5-sonnet-20241022"
         assert request.api_key == "sk-ant-test-key"
         assert request.base_url == "https://api.anthropic.com"
+
+
+def test_generate_title_returns_429_when_rate_limited(monkeypatch):
+    """A rate-limited LLM call should surface as 429, not 500."""
+
+    async def fake_acompletion(**kwargs):
+        raise litellm.RateLimitError(
+            message="slow down", llm_provider="openai", model=kwargs["model"]
+        )
+
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion)
+
+    response = TestClient(app).post("/api/generate-title", json={"content": "Hi"})
+
+    assert response.status_code == 429
@@ -0,0 +1,96 @@
+"""Tests for the json_body request dependency."""
+
+from typing import Annotated
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from canvas_chat.app import app as canvas_app
+from canvas_chat.json_body import document_json_bodies, json_body
+
+
+class Item(BaseModel):
+    """Example request body."""
+
+    name: str
+    count: int = 1
+
+
+class Order(BaseModel):
+    """Example request body with a nested model."""
+
+    items: list[Item]
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+
+    @app.post("/items")
+    async def create_item(item: Annotated[Item, Depends(json_body(Item))]):
+        return {"name": item.name, "count": item.count}
+
+    @app.post("/orders")
+    async def create_order(order: Annotated[Order, Depends(json_body(Order))]):
+        return {"count": len(order.items)}
+
+    document_json_bodies(app)
+    return TestClient(app)
+
+
+def request_body_schema(openapi: dict, path: str) -> dict:
+    """Resolve the JSON request body schema of a POST route."""
+    body = openapi["paths"][path]["post"]["requestBody"]
+    assert body["required"] is True
+    ref = body["content"]["application/json"]["schema"]["$ref"]
+    return openapi["components"]["schemas"][ref.rsplit("/", 1)[1]]
+
+
+def test_json_body_validates_raw_json():
+    """A valid body should be parsed into the model."""
+    response = make_client().post("/items", json={"name": "a", "count": 2})
+
+    assert response.status_code == 200
+    assert response.json() == {"name": "a", "count": 2}
+
+
+def test_json_body_reports_errors_like_fastapi():
+    """Invalid fields should produce a 422 with body-prefixed locations."""
+    response = make_client().post("/items", json={"count": "many"})
+
+    assert response.status_code == 422
+    locations = [error["loc"] for error in response.json()["detail"]]
+    assert ["body", "name"] in locations
+    assert ["body", "count"] in locations
+
+
+def test_json_body_rejects_malformed_json():
+    """Malformed JSON should be a 422, not a server error."""
+    response = make_client().post(
+        "/items", content=b"{not json", headers={"content-type": "application/json"}
+    )
+
+    assert response.status_code == 422
+
+
+def test_json_body_request_schema_is_documented():
+    """Routes using json_body should still document their request body."""
+    openapi = make_client().get("/openapi.json").json()
+
+    assert request_body_schema(openapi, "/items")["required"] == ["name"]
+    order = request_body_schema(openapi, "/orders")
+    item_ref = order["properties"]["items"]["items"]["$ref"]
+    assert item_ref.rsplit("/", 1)[1] in openapi["components"]["schemas"]
+
+
+def test_app_routes_document_json_bodies():
+    """Hot endpoints parsed with json_body should keep their OpenAPI schemas."""
+    openapi = TestClient(canvas_app).get("/openapi.json").json()
+
+    for path, field in [
+        ("/api/chat", "messages"),
+        ("/api/summarize", "messages"),
+        ("/api/committee", "question"),
+        ("/api/refine-query", "user_query"),
+    ]:
+        assert field in request_body_schema(openapi, path)["properties"], path
@@ -0,0 +1,231 @@
+"""Unit tests for LLM concurrency and rate limiting."""
+
+import asyncio
+import gc
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+import canvas_chat.app as app_module
+from canvas_chat.app import app
+from canvas_chat.cache import api_key_digest
+from canvas_chat.llm_limits import LLMLimiter, LLMSaturatedError, TokenBucket
+
+
+def test_token_bucket_allows_burst_then_blocks():
+    """A full bucket should allow capacity requests, then refuse."""
+    bucket = TokenBucket(rate=0.0, capacity=2)
+
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+
+def test_check_rate_disabled_by_default():
+    """Without a per-minute budget every request should pass."""
+    limiter = LLMLimiter(max_concurrent=4)
+
+    assert all(limiter.check_rate("sk-test") for _ in range(100))
+
+
+def test_check_rate_tracks_keys_separately():
+    """Each API key should have its own budget."""
+    limiter = LLMLimiter(max_concurrent=4, requests_per_minute=1)
+
+    assert limiter.check_rate("key-a")
+    assert not limiter.check_rate("key-a")
+    assert limiter.check_rate("key-b")
+
+
+def test_check_rate_does_not_store_raw_keys():
+    """Rate-limit buckets should be keyed by a digest, not the secret."""
+    limiter = LLMLimiter(max_concurrent=4, requests_per_minute=1)
+
+    limiter.check_rate("sk-secret")
+
+    assert limiter._buckets.get("sk-secret") is None
+    assert limiter._buckets.get(api_key_digest("sk-secret")) is not None
+
+
+def test_call_limits_concurrency():
+    """No more than max_concurrent calls should run at once."""
+    limiter = LLMLimiter(max_concurrent=2)
+    running = 0
+    peak = 0
+
+    async def fake_call(**kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return "ok"
+
+    async def run():
+        return await asyncio.gather(*(limiter.call(fake_call) for _ in range(6)))
+
+    assert asyncio.run(run()) == ["ok"] * 6
+    assert peak == 2
+
+
+def test_streaming_call_holds_slot_until_stream_ends():
+    """A streaming response should keep its slot until it is consumed."""
+
+    async def fake_stream():
+        yield "a"
+        yield "b"
+
+    async def fake_call(**kwargs):
+        return fake_stream()
+
+    async def run():
+        limiter = LLMLimiter(max_concurrent=1)
+        stream = await limiter.call(fake_call, stream=True)
+        assert limiter.in_flight == 1
+
+        assert [chunk async for chunk in stream] == ["a", "b"]
+        assert limiter.in_flight == 0
+
+        # Closing a stream early releases its slot exactly once
+        stream = await limiter.call(fake_call, stream=True)
+        assert await stream.__anext__() == "a"
+        await stream.aclose()
+        await stream.aclose()
+        assert limiter.in_flight == 0
+
+        # A stream dropped unclosed releases its slot on the event loop
+        await limiter.call(fake_call, stream=True)
+        gc.collect()
+        await asyncio.sleep(0)
+        assert limiter.in_flight == 0
+
+    asyncio.run(run())
+
+
+def test_call_fails_fast_when_saturated():
+    """Once every slot stays taken past the queue timeout, calls should fail."""
+
+    async def fake_stream():
+        yield "a"
+
+    async def fake_call(**kwargs):
+        return fake_stream()
+
+    async def run():
+        limiter = LLMLimiter(max_concurrent=1, queue_timeout=0.01)
+        held = await limiter.call(fake_call, stream=True)
+        with pytest.raises(LLMSaturatedError):
+            await limiter.call(fake_call, stream=True)
+
+        immediate = LLMLimiter(max_concurrent=1, queue_timeout=0)
+        held_too = await immediate.call(fake_call, stream=True)
+        with pytest.raises(LLMSaturatedError):
+            await immediate.call(fake_call, stream=True)
+
+        # Draining a held stream frees its slot for the next caller
+        assert [chunk async for chunk in held] == ["a"]
+        assert [chunk async for chunk in held_too] == ["a"]
+        stream = await limiter.call(fake_call, stream=True)
+        assert [chunk async for chunk in stream] == ["a"]
+
+    asyncio.run(run())
+
+
+def test_queued_calls_are_shared_between_keys():
+    """Freed slots should rotate between waiting keys, not serve one key's backlog."""
+    order = []
+
+    async def run():
+        limiter = LLMLimiter(max_concurrent=1)
+        gate = asyncio.Event()
+
+        async def fake_call(**kwargs):
+            order.append(kwargs["api_key"])
+            await gate.wait()
+
+        first = asyncio.create_task(limiter.call(fake_call, api_key="busy"))
+        await asyncio.sleep(0)
+        queued = [
+            asyncio.create_task(limiter.call(fake_call, api_key="busy"))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        queued.append(asyncio.create_task(limiter.call(fake_call, api_key="other")))
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(first, *queued)
+
+    asyncio.run(run())
+
+    assert order == ["busy", "busy", "other", "busy", "busy"]
+
+
+def test_cancelled_waiter_does_not_leak_slot():
+    """A caller that gives up while queued should not take or lose a slot."""
+
+    async def run():
+        limiter = LLMLimiter(max_concurrent=1)
+        gate = asyncio.Event()
+
+        async def fake_call(**kwargs):
+            await gate.wait()
+            return "ok"
+
+        first = asyncio.create_task(limiter.call(fake_call))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(limiter.call(fake_call))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        gate.set()
+        assert await first == "ok"
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.in_flight == 0
+        assert await limiter.call(fake_call) == "ok"
+
+    asyncio.run(run())
+
+
+def test_saturated_limiter_returns_429(monkeypatch):
+    """A saturated server should answer with 429 instead of queueing forever."""
+
+    async def fake_acompletion(**kwargs):
+        raise AssertionError("no LLM call should be made while saturated")
+
+    limiter = LLMLimiter(max_concurrent=0, queue_timeout=0)
+    monkeypatch.setattr(app_module, "llm_limiter", limiter)
+    monkeypatch.setattr(app_module.litellm, "acompletion", fake_acompletion)
+    app_module._summary_cache.clear()
+
+    response = TestClient(app).post(
+        "/api/summarize",
+        json={"messages": [{"role": "user", "content": "saturated"}]},
+    )
+
+    assert response.status_code == 429
+
+
+def test_iter_content_deltas_closes_abandoned_stream():
+    """Stopping early should close the LLM stream and free its slot."""
+
+    def chunk(text):
+        delta = SimpleNamespace(content=text)
+        return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def fake_stream():
+        yield chunk("a")
+        yield chunk("b")
+
+    async def fake_call(**kwargs):
+        return fake_stream()
+
+    async def run():
+        limiter = LLMLimiter(max_concurrent=1)
+        response = await limiter.call(fake_call, stream=True)
+        deltas = app_module.iter_content_deltas(response)
+        assert await deltas.__anext__() == "a"
+        await deltas.aclose()
+        assert limiter.in_flight == 0
+
+    asyncio.run(run())
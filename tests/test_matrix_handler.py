@@ -0,0 +1,175 @@
+"""Tests for matrix plugin helpers."""
+
+from types import SimpleNamespace
+
+import litellm
+from fastapi.testclient import TestClient
+
+from canvas_chat.app import app
+from canvas_chat.plugins.matrix_handler import (
+    PARSE_TWO_LISTS_SYSTEM_PROMPT,
+    parse_cell_line,
+    strip_code_fence,
+)
+
+
+def test_strip_code_fence_json_block():
+    """A ```json fenced block should be unwrapped."""
+    text = '```json\n{"rows": ["A"], "columns": ["B"]}\n```'
+
+    assert strip_code_fence(text) == '{"rows": ["A"], "columns": ["B"]}'
+
+
+def test_strip_code_fence_bare_block_with_surrounding_text():
+    """A bare fence inside extra prose should still be unwrapped."""
+    text = 'Here you go:\n```\n{"rows": []}\n```\nHope that helps.'
+
+    assert strip_code_fence(text) == '{"rows": []}'
+
+
+def test_strip_code_fence_without_fence():
+    """Text without a fence should be returned unchanged."""
+    assert strip_code_fence('{"rows": []}') == '{"rows": []}'
+
+
+def test_parse_cell_line_valid():
+    """A JSON line with an in-range index should parse."""
+    assert parse_cell_line('{"i": 1, "eval": " Good fit. "}', 2) == {
+        "i": 1,
+        "eval": "Good fit.",
+    }
+
+
+def test_parse_cell_line_rejects_invalid_lines():
+    """Prose, broken JSON, and out-of-range indices should be ignored."""
+    assert parse_cell_line("Here are the evaluations:", 2) is None
+    assert parse_cell_line('{"i": 0, "eval": ', 2) is None
+    assert parse_cell_line('{"i": 5, "eval": "x"}', 2) is None
+    assert parse_cell_line('{"i": "0", "eval": "x"}', 2) is None
+
+
+def test_matrix_fill_batch_streams_cell_events(monkeypatch):
+    """Each completed JSON line should be streamed back as a cell event."""
+    calls = []
+
+    def chunk(content):
+        delta = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def fake_stream():
+        for part in ['{"i": 0, "eval": "A"}\n{"i": 1', ', "eval": "B"}']:
+            yield chunk(part)
+
+    async def fake_acompletion(**kwargs):
+        calls.append(kwargs)
+        return fake_stream()
+
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion)
+
+    client = TestClient(app)
+    response = client.post(
+        "/api/matrix/fill-batch",
+        json={
+            "cells": [["Python", "Speed"], ["Rust", "Speed"]],
+            "context": "Languages",
+            "messages": [],
+            "api_key": "sk-test",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.text.count("event: cell") == 2
+    assert '{"i":0,"eval":"A"}' in response.text
+    assert '{"i":1,"eval":"B"}' in response.text
+    assert "event: done" in response.text
+    assert len(calls) == 1
+    assert (
+        "1. Row item: Rust | Column item: Speed" in calls[0]["messages"][-1]["content"]
+    )
+
+
+def test_matrix_fill_batch_requires_cells():
+    """An empty batch should be rejected."""
+    client = TestClient(app)
+    response = client.post(
+        "/api/matrix/fill-batch",
+        json={"cells": [], "context": "x", "messages": []},
+    )
+
+    assert response.status_code == 400
+
+
+def test_matrix_fill_routes_document_request_bodies():
+    """Matrix fill bodies are parsed with json_body but should stay documented."""
+    openapi = TestClient(app).get("/openapi.json").json()
+    schemas = openapi["components"]["schemas"]
+
+    for path, field in [
+        ("/api/matrix/fill", "row_item"),
+        ("/api/matrix/fill-batch", "cells"),
+    ]:
+        body = openapi["paths"][path]["post"]["requestBody"]
+        ref = body["content"]["application/json"]["schema"]["$ref"]
+        assert field in schemas[ref.rsplit("/", 1)[1]]["required"], path
+
+
+def test_parse_two_lists_validates_llm_json(monkeypatch):
+    """Fenced JSON should be validated, with numeric labels coerced to strings."""
+    calls = []
+
+    async def fake_acompletion(**kwargs):
+        calls.append(kwargs)
+        content = '```json\n{"rows": ["Python", 3], "columns": ["Speed"]}\n```'
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion)
+
+    client = TestClient(app)
+    response = client.post(
+        "/api/parse-two-lists",
+        json={"contents": ["Python vs 3 on speed"], "context": "Languages"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"rows": ["Python", "3"], "columns": ["Speed"]}
+    system, user = calls[0]["messages"]
+    assert system["content"] == PARSE_TWO_LISTS_SYSTEM_PROMPT
+    assert user["content"].startswith("Matrix context: Languages\n\nText:\n")
+
+
+def test_parse_two_lists_falls_back_to_regex_for_invalid_json(monkeypatch):
+    """Malformed JSON should fall back to regex extraction of each array."""
+
+    async def fake_acompletion(**kwargs):
+        content = '{"rows": ["A", "B"], "columns": ["C"],}'
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion)
+
+    client = TestClient(app)
+    response = client.post(
+        "/api/parse-two-lists",
+        json={"contents": ["A and B vs C"], "context": "Letters"},
+    )
+
+    assert response.json() == {"rows": ["A", "B"], "columns": ["C"]}
+
+
+def test_parse_two_lists_returns_429_when_rate_limited(monkeypatch):
+    """A rate-limited LLM call should surface as 429, not 500."""
+
+    async def fake_acompletion(**kwargs):
+        raise litellm.RateLimitError(
+            message="slow down", llm_provider="openai", model=kwargs["model"]
+        )
+
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion)
+
+    response = TestClient(app).post(
+        "/api/parse-two-lists",
+        json={"contents": ["Python vs Go"], "context": "Languages"},
+    )
+
+    assert response.status_code == 429
@@ -42,6 +42,10 @@ if (!global.indexedDB) {
     };
 }
 
+if (!global.window) {
+    global.window = { location: { pathname: '/' } };
+}
+
 // Now import modules (storage.js will use the mocked indexedDB)
 import { PluginTestHarness } from '../src/canvas_chat/static/js/plugin-test-harness.js';
 import { PRIORITY } from '../src/canvas_chat/static/js/feature-registry.js';
@@ -309,4 +313,121 @@ await asyncTest('Matrix command has BUILTIN priority', async () => {
     assertTrue(feature !== undefined, 'Feature should be registered');
 });
 
+/**
+ * Load the matrix plugin with the stubs Fill All needs and a 2x2 empty matrix.
+ * @returns {Promise<Object>} The loaded feature
+ */
+async function loadMatrixForFillAll() {
+    const harness = new PluginTestHarness();
+    await harness.loadPlugin({
+        id: 'matrix',
+        feature: MatrixFeature,
+        slashCommands: [{ command: '/matrix', handler: 'handleMatrix' }],
+    });
+    const feature = harness.getPlugin('matrix');
+
+    const groups = new Map();
+    feature.streamingManager = {
+        register(id, options) {
+            if (!groups.has(options.groupId)) groups.set(options.groupId, new Map());
+            groups.get(options.groupId).set(id, options);
+        },
+        unregister(id) {
+            for (const group of groups.values()) group.delete(id);
+        },
+        getGroupNodes(groupId) {
+            return groups.get(groupId) || new Map();
+        },
+    };
+    // The harness context has no featureRegistry; wire it so hook lookups are real
+    feature.featureRegistry = harness.registry;
+    // MockApp.buildLLMRequest drops extra params; keep them like the real app does
+    feature.buildLLMRequest = (params) => ({ model: 'gpt-4', ...params });
+    feature.graph.resolveContext = () => [{ role: 'user', content: 'History' }];
+    feature.canvas.nodeElements = new Map();
+    feature.graph.addNode({
+        id: 'fill-matrix',
+        type: 'matrix',
+        context: 'Compare',
+        rowItems: ['A', 'B'],
+        colItems: ['X', 'Y'],
+        cells: {},
+        position: { x: 0, y: 0 },
+    });
+    return feature;
+}
+
+/**
+ * Build an SSE Response from [event, data] pairs.
+ * @param {Array<[string, string]>} events
+ * @returns {Response}
+ */
+function sseResponse(events) {
+    const body = events.map(([event, data]) => `event: ${event}\r\ndata: ${data}\r\n\r\n`).join('');
+    return new Response(body, { headers: { 'Content-Type': 'text/event-stream' } });
+}
+
+// Test: Fill All uses one batch request when no prompt hook is registered
+await asyncTest('handleMatrixFillAll fills cells with one batch request', async () => {
+    const feature = await loadMatrixForFillAll();
+    const requests = [];
+    const originalFetch = global.fetch;
+    global.fetch = async (url, options) => {
+        requests.push({ url, body: JSON.parse(options.body) });
+        if (url.endsWith('/api/matrix/fill-batch')) {
+            // Cell 3 is left unanswered and must be filled individually
+            return sseResponse([
+                ['cell', '{"i":0,"eval":"AX"}'],
+                ['cell', '{"i":1,"eval":"AY"}'],
+                ['cell', '{"i":2,"eval":"BX"}'],
+                ['done', ''],
+            ]);
+        }
+        return sseResponse([
+            ['message', 'BY'],
+            ['done', ''],
+        ]);
+    };
+
+    try {
+        await feature.handleMatrixFillAll('fill-matrix');
+    } finally {
+        global.fetch = originalFetch;
+    }
+
+    assertTrue(requests[0].url.endsWith('/api/matrix/fill-batch'), 'First request is the batch');
+    assertTrue(requests[0].body.cells.length === 4, 'Batch carries every empty cell');
+    assertTrue(requests.length === 2, 'Only the unanswered cell gets its own request');
+    assertTrue(requests[1].url.endsWith('/api/matrix/fill'), 'Fallback uses the single-cell endpoint');
+
+    const { cells } = feature.graph.getNode('fill-matrix');
+    assertTrue(cells['0-0'].content === 'AX' && cells['0-0'].filled, 'Cell 0-0 filled from batch');
+    assertTrue(cells['1-0'].content === 'BX', 'Cell 1-0 filled from batch');
+    assertTrue(cells['1-1'].content === 'BY' && cells['1-1'].filled, 'Cell 1-1 filled by fallback');
+});
+
+// Test: a matrix:cell:prompt hook keeps Fill All on per-cell requests
+await asyncTest('handleMatrixFillAll uses per-cell requests when a prompt hook exists', async () => {
+    const feature = await loadMatrixForFillAll();
+    feature.featureRegistry.on('matrix:cell:prompt', () => {});
+    const urls = [];
+    const originalFetch = global.fetch;
+    global.fetch = async (url) => {
+        urls.push(url);
+        return sseResponse([
+            ['message', 'ok'],
+            ['done', ''],
+        ]);
+    };
+
+    try {
+        await feature.handleMatrixFillAll('fill-matrix');
+    } finally {
+        global.fetch = originalFetch;
+    }
+
+    assertTrue(urls.length === 4, 'One request per cell');
+    assertTrue(urls.every((url) => url.endsWith('/api/matrix/fill')), 'No batch request');
+});
+
 console.log('\n=== All Matrix plugin tests passed! ===\n');
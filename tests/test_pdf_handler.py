@@ -0,0 +1,37 @@
+"""Tests for the PDF file upload handler."""
+
+import asyncio
+import threading
+
+import pymupdf
+
+from canvas_chat.plugins.pdf_handler import PdfFileUploadHandler
+
+
+def _make_sample_pdf_bytes() -> bytes:
+    doc = pymupdf.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), "Hello from page one")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def test_process_file_extracts_text_off_the_event_loop(monkeypatch):
+    """PDF parsing should run in a worker thread, not on the event loop."""
+    handler = PdfFileUploadHandler()
+    extract = handler.extract_text_from_pdf
+    threads = []
+
+    def recording_extract(pdf_bytes):
+        threads.append(threading.current_thread())
+        return extract(pdf_bytes)
+
+    monkeypatch.setattr(handler, "extract_text_from_pdf", recording_extract)
+
+    result = asyncio.run(handler.process_file(_make_sample_pdf_bytes(), "doc.pdf"))
+
+    assert result["title"] == "doc"
+    assert result["page_count"] == 1
+    assert "Hello from page one" in result["content"]
+    assert threads and threads[0] is not threading.main_thread()
@@ -8,10 +8,13 @@ import asyncio
 import io
 from pathlib import Path
 
+import litellm
 import pytest
+from fastapi.testclient import TestClient
 from PIL import Image
 from pptx import Presentation
 
+from canvas_chat.app import app
 from canvas_chat.plugins import pptx_handler
 
 
@@ -93,3 +96,28 @@ class TestPptxHandler:
 
         assert slides[1]["title"] == "Results"
         assert "Key numbers" in slides[1]["text_content"]
+
+
+@pytest.mark.parametrize(
+    ("path", "payload"),
+    [
+        ("/api/pptx/caption-title-slide", {"slide_text": "Hello"}),
+        (
+            "/api/pptx/caption-title-deck",
+            {"slides": [{"title": "Intro", "text_content": "Hello"}]},
+        ),
+    ],
+)
+def test_caption_endpoints_return_429_when_rate_limited(monkeypatch, path, payload):
+    """A rate-limited LLM call should surface as 429, not 500."""
+
+    async def fake_acompletion(**kwargs):
+        raise litellm.RateLimitError(
+            message="slow down", llm_provider="openai", model=kwargs["model"]
+        )
+
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion)
+
+    response = TestClient(app).post(path, json=payload)
+
+    assert response.status_code == 429
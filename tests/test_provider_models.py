@@ -1,8 +1,12 @@
+import asyncio
+import json
+
 import litellm
 from fastapi.testclient import TestClient
 
 import canvas_chat.app as app_module
 from canvas_chat.app import app
+from canvas_chat.cache import TTLCache, api_key_digest
 from canvas_chat.config import AppConfig
 
 
@@ -35,3 +39,156 @@ def test_provider_models_copilot_blocked_in_admin_mode(monkeypatch):
 
     assert response.status_code == 400
     assert "admin mode" in response.json()["detail"].lower()
+
+
+def test_provider_models_anthropic_serves_static_list():
+    """Anthropic models come from the static list, gated on the key format."""
+    client = TestClient(app)
+
+    valid = client.post(
+        "/api/provider-models",
+        json={"provider": "anthropic", "api_key": "sk-ant-test"},
+    )
+    invalid = client.post(
+        "/api/provider-models",
+        json={"provider": "anthropic", "api_key": "not-a-key"},
+    )
+
+    assert valid.status_code == 200
+    assert valid.json() == app_module.ANTHROPIC_MODELS
+    assert invalid.json() == []
+
+
+def test_provider_models_are_cached_per_key(monkeypatch):
+    """Repeat fetches for the same key should reuse the list, but not failures."""
+    calls = []
+
+    async def fake_fetch_openai_models(api_key):
+        calls.append(api_key)
+        if api_key == "sk-broken":
+            return []
+        return [
+            {
+                "id": "openai/gpt-4o",
+                "name": "gpt-4o",
+                "provider": "OpenAI",
+                "context_window": 128000,
+            }
+        ]
+
+    monkeypatch.setattr(app_module, "fetch_openai_models", fake_fetch_openai_models)
+    cache = TTLCache(maxsize=8)
+    monkeypatch.setattr(app_module, "_provider_models_cache", cache)
+    client = TestClient(app)
+
+    for api_key in ["sk-one", "sk-one", "sk-two", "sk-broken", "sk-broken"]:
+        response = client.post(
+            "/api/provider-models", json={"provider": "openai", "api_key": api_key}
+        )
+        assert response.status_code == 200
+
+    assert calls == ["sk-one", "sk-two", "sk-broken", "sk-broken"]
+    # Keys are hashed the same way as every other key-scoped cache
+    assert cache.get(("openai", api_key_digest("sk-one"))) is not None
+
+
+def test_list_models_includes_registry_and_ollama(monkeypatch):
+    """The models endpoint should serve registry models plus Ollama models."""
+
+    async def no_ollama_models():
+        return []
+
+    client = TestClient(app)
+    monkeypatch.setattr(app_module, "fetch_ollama_models", no_ollama_models)
+    registry_only = client.get("/api/models").json()
+    assert [m["id"] for m in registry_only] == [
+        m["id"] for m in app_module.MODEL_REGISTRY
+    ]
+
+    async def fake_ollama_models():
+        return [
+            {
+                "id": "ollama_chat/llama3",
+                "name": "llama3",
+                "provider": "Ollama",
+                "context_window": 8192,
+            }
+        ]
+
+    monkeypatch.setattr(app_module, "fetch_ollama_models", fake_ollama_models)
+    response = client.get("/api/models")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == len(registry_only) + 1
+    assert data[-1]["id"] == "ollama_chat/llama3"
+
+
+def test_fetch_ollama_models_is_cached(monkeypatch):
+    """Concurrent and repeated lookups should query Ollama only once."""
+    calls = []
+
+    async def fake_request_ollama_models():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return [{"id": "ollama_chat/llama3"}]
+
+    monkeypatch.setattr(app_module, "request_ollama_models", fake_request_ollama_models)
+    monkeypatch.setattr(app_module, "_ollama_models_cache", TTLCache(maxsize=1, ttl=30))
+    monkeypatch.setattr(app_module, "_ollama_models_stale", None)
+    monkeypatch.setattr(app_module, "_ollama_refresh_task", None)
+
+    async def run():
+        first = await asyncio.gather(
+            *(app_module.fetch_ollama_models() for _ in range(5))
+        )
+        second = await app_module.fetch_ollama_models()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert all(result == [{"id": "ollama_chat/llama3"}] for result in first)
+    assert second == [{"id": "ollama_chat/llama3"}]
+    assert len(calls) == 1
+
+
+def test_fetch_ollama_models_serves_stale_list_while_refreshing(monkeypatch):
+    """An expired list should be returned at once and refreshed in the background."""
+    release = None
+
+    async def slow_request_ollama_models():
+        await release.wait()
+        return [{"id": "ollama_chat/new"}]
+
+    monkeypatch.setattr(app_module, "request_ollama_models", slow_request_ollama_models)
+    monkeypatch.setattr(app_module, "_ollama_models_cache", TTLCache(maxsize=1, ttl=30))
+    monkeypatch.setattr(app_module, "_ollama_models_stale", [{"id": "ollama_chat/old"}])
+    monkeypatch.setattr(app_module, "_ollama_refresh_task", None)
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        stale = await app_module.fetch_ollama_models()
+        release.set()
+        await app_module._ollama_refresh_task
+        fresh = await app_module.fetch_ollama_models()
+        return stale, fresh
+
+    stale, fresh = asyncio.run(run())
+
+    assert stale == [{"id": "ollama_chat/old"}]
+    assert fresh == [{"id": "ollama_chat/new"}]
+
+
+def test_merged_models_json_is_rebuilt_only_for_a_new_ollama_list(monkeypatch):
+    """The merged /api/models body should be reused until Ollama is re-fetched."""
+    monkeypatch.setattr(app_module, "_merged_models_body", None)
+    first = [{"id": "ollama_chat/a", "name": "a", "provider": "Ollama"}]
+    refreshed = [{"id": "ollama_chat/b", "name": "b", "provider": "Ollama"}]
+
+    body = app_module._merged_models_json(first)
+
+    assert app_module._merged_models_json(first) is body
+    rebuilt = app_module._merged_models_json(refreshed)
+    assert rebuilt is not body
+    assert json.loads(rebuilt)[-1]["id"] == "ollama_chat/b"
@@ -0,0 +1,57 @@
+"""Tests for /api/refine-query endpoint."""
+
+from types import SimpleNamespace
+
+import litellm
+from fastapi.testclient import TestClient
+
+import canvas_chat.app as app_module
+from canvas_chat.app import app
+
+
+def test_refine_query_reuses_cached_refinement(monkeypatch):
+    """Identical refine requests should call the LLM once; failures are not cached."""
+    replies = ["", '"Toffoli gate quantum computing"']
+    calls = []
+
+    async def fake_acompletion(**kwargs):
+        calls.append(kwargs)
+        message = SimpleNamespace(content=replies[len(calls) - 1])
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion)
+    monkeypatch.setattr(litellm, "supports_response_schema", lambda **_: False)
+    app_module._refined_query_cache.clear()
+
+    client = TestClient(app)
+    payload = {"user_query": "how does this work?", "context": "Toffoli Gate"}
+    empty = client.post("/api/refine-query", json=payload)
+    first = client.post("/api/refine-query", json=payload)
+    second = client.post("/api/refine-query", json=payload)
+
+    assert empty.json()["refined_query"] == "how does this work?"
+    assert first.json() == second.json()
+    assert second.json()["refined_query"] == "Toffoli gate quantum computing"
+    assert len(calls) == 2
+
+
+def test_refine_query_cache_is_scoped_to_api_key(monkeypatch):
+    """A refinement cached for one key should not be served to another key."""
+    calls = []
+
+    async def fake_acompletion(**kwargs):
+        calls.append(kwargs)
+        message = SimpleNamespace(content="Toffoli gate quantum computing")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion)
+    monkeypatch.setattr(litellm, "supports_response_schema", lambda **_: False)
+    app_module._refined_query_cache.clear()
+
+    client = TestClient(app)
+    payload = {"user_query": "what is this?", "context": "Toffoli Gate"}
+    client.post("/api/refine-query", json={**payload, "api_key": "sk-a"})
+    client.post("/api/refine-query", json={**payload, "api_key": "sk-a"})
+    client.post("/api/refine-query", json={**payload, "api_key": "sk-b"})
+
+    assert [call["api_key"] for call in calls] == ["sk-a", "sk-b"]
@@ -0,0 +1,88 @@
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+import canvas_chat.app as app_module
+from canvas_chat.app import app
+from canvas_chat.config import AppConfig, ModelConfig, PluginConfig
+
+
+def test_root_serves_index_with_etag():
+    """The index page should be served with an ETag for revalidation."""
+    client = TestClient(app)
+    response = client.get("/")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert response.headers["etag"]
+    assert response.headers["last-modified"].endswith("GMT")
+    assert "</body>" in response.text
+
+
+def test_root_returns_304_when_etag_matches():
+    """A matching If-None-Match header should short-circuit with 304."""
+    client = TestClient(app)
+    etag = client.get("/").headers["etag"]
+
+    response = client.get("/", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_root_returns_304_for_etag_lists_weak_tags_and_wildcard():
+    """If-None-Match lists, weak validators and * should also match."""
+    client = TestClient(app)
+    etag = client.get("/").headers["etag"]
+
+    for header in [f'"stale", {etag}', f"W/{etag}", f'W/"stale",W/{etag}', "*"]:
+        response = client.get("/", headers={"If-None-Match": header})
+        assert response.status_code == 304, header
+
+    response = client.get("/", headers={"If-None-Match": '"stale", W/"other"'})
+    assert response.status_code == 200
+
+
+def test_root_injects_plugin_scripts(monkeypatch):
+    """JS plugins should be injected and change the ETag."""
+    plain_etag = TestClient(app).get("/").headers["etag"]
+    config = AppConfig(plugins=[PluginConfig(js_path=Path("/tmp/my-plugin.js"))])
+    monkeypatch.setattr(app_module, "get_admin_config", lambda: config)
+
+    response = TestClient(app).get("/")
+
+    assert response.status_code == 200
+    assert 'src="/api/plugins/my-plugin.js"' in response.text
+    assert response.headers["etag"] != plain_etag
+
+
+def test_config_and_plugins_endpoints_keep_their_json_shape(monkeypatch):
+    """/api/config and /api/plugins should serialize through their models."""
+    config = AppConfig(
+        models=[ModelConfig(id="openai/gpt-4o", name="GPT-4o")],
+        plugins=[PluginConfig(js_path=Path("/tmp/my-plugin.js"))],
+        admin_mode=True,
+    )
+    monkeypatch.setattr(app_module, "get_admin_config", lambda: config)
+    client = TestClient(app)
+
+    assert client.get("/api/config").json() == {
+        "adminMode": True,
+        "models": [
+            {
+                "id": "openai/gpt-4o",
+                "name": "GPT-4o",
+                "provider": "Openai",
+                "context_window": 128000,
+            }
+        ],
+    }
+    assert client.get("/api/plugins").json() == {
+        "plugins": [
+            {
+                "name": "my-plugin.js",
+                "url": "/api/plugins/my-plugin.js",
+                "id": "my-plugin",
+            }
+        ]
+    }
@@ -0,0 +1,84 @@
+"""Tests for the optional Redis-backed shared cache."""
+
+import asyncio
+from types import SimpleNamespace
+
+import litellm
+from fastapi.testclient import TestClient
+
+import canvas_chat.app as app_module
+from canvas_chat.app import app
+from canvas_chat.shared_cache import SharedCache, create_shared_cache
+
+
+class InMemoryRedis:
+    """Minimal stand-in for the redis.asyncio client used by SharedCache."""
+
+    def __init__(self, fail: bool = False):
+        self.data: dict[str, bytes] = {}
+        self.ttls: dict[str, int] = {}
+        self.fail = fail
+
+    async def get(self, key):
+        if self.fail:
+            raise ConnectionError("redis down")
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.data[key] = value.encode("utf-8")
+        self.ttls[key] = ex
+
+    async def aclose(self):
+        pass
+
+
+def test_create_shared_cache_is_disabled_without_url():
+    """No URL should mean no shared cache."""
+    assert create_shared_cache(None) is None
+    assert create_shared_cache("") is None
+
+
+def test_shared_cache_round_trips_and_treats_errors_as_misses():
+    """Values should round-trip as str; Redis errors should not propagate."""
+
+    async def exercise():
+        redis = InMemoryRedis()
+        cache = SharedCache(redis)
+        await cache.set("k", "héllo", ttl=60)
+        assert await cache.get("k") == "héllo"
+        assert await cache.get("missing") is None
+        assert redis.ttls["canvas-chat:k"] == 60
+
+        broken = SharedCache(InMemoryRedis(fail=True))
+        await broken.set("k", "v", ttl=60)
+        assert await broken.get("k") is None
+
+    asyncio.run(exercise())
+
+
+def test_summarize_uses_shared_cache_across_workers(monkeypatch):
+    """A summary stored by one worker should be served to another from Redis."""
+    calls = []
+
+    async def fake_acompletion(**kwargs):
+        calls.append(kwargs)
+        message = SimpleNamespace(content="A short summary")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    redis = InMemoryRedis()
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion)
+    monkeypatch.setattr(app_module, "_shared_cache", SharedCache(redis))
+    app_module._summary_cache.clear()
+
+    client = TestClient(app)
+    payload = {"messages": [{"role": "user", "content": "Hello"}]}
+    first = client.post("/api/summarize", json=payload)
+    # Simulate another worker: its in-process cache is empty
+    app_module._summary_cache.clear()
+    second = client.post("/api/summarize", json=payload)
+
+    assert first.json() == second.json() == {"summary": "A short summary"}
+    assert len(calls) == 1
+    assert list(redis.ttls.values()) == [app_module.SHARED_SUMMARY_TTL]
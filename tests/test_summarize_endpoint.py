@@ -0,0 +1,168 @@
+"""Tests for /api/summarize endpoint."""
+
+import asyncio
+from types import SimpleNamespace
+
+import litellm
+from fastapi.testclient import TestClient
+
+import canvas_chat.app as app_module
+from canvas_chat.app import app
+
+
+def test_summarize_reuses_cached_summary(monkeypatch):
+    """Identical summarize requests should only call the LLM once."""
+    calls = []
+
+    async def fake_acompletion(**kwargs):
+        calls.append(kwargs)
+        message = SimpleNamespace(content="A short summary")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion)
+    app_module._summary_cache.clear()
+
+    client = TestClient(app)
+    payload = {
+        "messages": [{"role": "user", "content": "Hello"}],
+        "model": "openai/gpt-4o-mini",
+        "api_key": "sk-test",
+    }
+    first = client.post("/api/summarize", json=payload)
+    second = client.post("/api/summarize", json=payload)
+
+    assert first.json() == {"summary": "A short summary"}
+    assert second.json() == {"summary": "A short summary"}
+    assert len(calls) == 1
+    assert calls[0]["messages"][-1] == {
+        "role": "user",
+        "content": "Conversation:\nuser: Hello\n\nSummary:",
+    }
+
+    payload["messages"][0]["content"] = "Goodbye"
+    client.post("/api/summarize", json=payload)
+    assert len(calls) == 2
+
+
+def test_summarize_cache_is_scoped_to_api_key(monkeypatch):
+    """A cached summary should not be served to a caller with a different key."""
+    calls = []
+
+    async def fake_acompletion(**kwargs):
+        calls.append(kwargs)
+        if kwargs["api_key"] == "sk-revoked":
+            raise litellm.AuthenticationError("revoked", "openai", "gpt-4o-mini")
+        message = SimpleNamespace(content="A short summary")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion)
+    app_module._summary_cache.clear()
+
+    client = TestClient(app)
+    payload = {"messages": [{"role": "user", "content": "Hello"}], "api_key": "sk-a"}
+    assert client.post("/api/summarize", json=payload).status_code == 200
+
+    payload["api_key"] = "sk-revoked"
+    response = client.post("/api/summarize", json=payload)
+
+    assert response.status_code == 500
+    assert len(calls) == 2
+
+
+def test_generate_summary_reuses_cached_node_summary(monkeypatch):
+    """Semantic zoom summaries should be cached, but fallbacks should not."""
+    replies = ["", ' "Python decorator patterns"\n']
+    calls = []
+
+    async def fake_acompletion(**kwargs):
+        calls.append(kwargs)
+        message = SimpleNamespace(content=replies[len(calls) - 1])
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion)
+    app_module._node_summary_cache.clear()
+
+    client = TestClient(app)
+    payload = {"content": "Decorators wrap functions", "model": "openai/gpt-4o"}
+    fallback = client.post("/api/generate-summary", json=payload)
+    first = client.post("/api/generate-summary", json=payload)
+    second = client.post("/api/generate-summary", json=payload)
+
+    assert fallback.json() == {"summary": "Decorators wrap functions"}
+    assert first.json() == {"summary": "Python decorator patterns"}
+    assert second.json() == {"summary": "Python decorator patterns"}
+    assert len(calls) == 2
+
+    # Another credential does not reuse the cached summary
+    replies.append("Decorator patterns")
+    client.post("/api/generate-summary", json={**payload, "api_key": "sk-other"})
+    assert len(calls) == 3
+
+
+def test_generate_summary_cache_ignores_content_past_prompt_limit(monkeypatch):
+    """Only the first 2000 characters reach the LLM, so only they key the cache."""
+    calls = []
+
+    async def fake_acompletion(**kwargs):
+        calls.append(kwargs)
+        message = SimpleNamespace(content="Long node summary")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion)
+    app_module._node_summary_cache.clear()
+
+    client = TestClient(app)
+    head = "x" * 2000
+    for tail in ("first ending", "second ending"):
+        response = client.post(
+            "/api/generate-summary",
+            json={"content": head + tail, "model": "openai/gpt-4o"},
+        )
+        assert response.json() == {"summary": "Long node summary"}
+
+    assert len(calls) == 1
+
+
+def test_generate_summary_coalesces_concurrent_requests(monkeypatch):
+    """Simultaneous requests for the same content should share one LLM call."""
+    calls = []
+
+    async def fake_acompletion(**kwargs):
+        calls.append(kwargs)
+        await asyncio.sleep(0.01)
+        message = SimpleNamespace(content="Shared summary")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion)
+    app_module._node_summary_cache.clear()
+
+    async def summarize_twice():
+        request = app_module.GenerateSummaryRequest(content="Duplicated node")
+        return await asyncio.gather(
+            app_module.generate_summary(request),
+            app_module.generate_summary(request.model_copy()),
+        )
+
+    results = asyncio.run(summarize_twice())
+
+    assert results == [{"summary": "Shared summary"}] * 2
+    assert len(calls) == 1
+    assert app_module._node_summary_inflight == {}
+
+
+def test_generate_summary_returns_429_when_rate_limited(monkeypatch):
+    """A rate-limited node summary should surface as 429, not 500."""
+
+    async def fake_acompletion(**kwargs):
+        raise litellm.RateLimitError(
+            message="slow down", llm_provider="openai", model=kwargs["model"]
+        )
+
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion)
+    app_module._node_summary_cache.clear()
+
+    response = TestClient(app).post(
+        "/api/generate-summary", json={"content": "Rate limited node"}
+    )
+
+    assert response.status_code == 429
@@ -1,6 +1,26 @@
 """Unit tests for utility functions in app.py - no API calls required."""
 
-from canvas_chat.app import extract_provider
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import litellm
+import pytest
+from sse_starlette import ServerSentEvent
+
+import canvas_chat.app as app_module
+from canvas_chat.app import (
+    build_system_message,
+    coalesce_deltas,
+    count_tokens,
+    encode_message_event,
+    extract_provider,
+    get_context_window,
+    get_exa_client,
+    is_chat_model,
+    iter_content_deltas,
+)
+from canvas_chat.cache import TTLCache
 
 # --- extract_provider() tests ---
 
@@ -71,3 +91,265 @@ def test_extract_provider_case_sensitivity():
     """Test that extract_provider preserves case."""
     assert extract_provider("OpenAI/gpt-4o") == "OpenAI"
     assert extract_provider("ANTHROPIC/claude") == "ANTHROPIC"
+
+
+# --- is_chat_model() tests ---
+
+
+def test_is_chat_model_filters_provider_model_lists():
+    """Chat models are kept; audio, embedding and guard models are dropped."""
+    assert is_chat_model("gpt-4o")
+    assert is_chat_model("GPT-4.1-mini")
+    assert is_chat_model("llama-3.3-70b-versatile")
+    assert not is_chat_model("gpt-4o-realtime-preview")
+    assert not is_chat_model("gpt-3.5-turbo-instruct")
+    assert not is_chat_model("text-embedding-3-small")
+    assert not is_chat_model("meta-llama/llama-guard-4-12b")
+    assert not is_chat_model("babbage-002")
+
+
+# --- get_context_window() tests ---
+
+
+def test_get_context_window_uses_first_matching_pattern():
+    """Earlier, more specific patterns win; unknown models get the default."""
+    assert get_context_window("gpt-4-turbo-2024-04-09") == 128000
+    assert get_context_window("gpt-4-0613") == 8192
+    assert get_context_window("Gemini-1.5-Pro") == 2000000
+    assert get_context_window("some-new-model") == 128000
+
+
+# --- count_tokens() tests ---
+
+
+def test_count_tokens_is_cached(monkeypatch):
+    """Repeated counts for the same model and long text should hit the cache."""
+    calls = []
+
+    def fake_token_counter(model, text):
+        calls.append((model, text))
+        return len(text)
+
+    monkeypatch.setattr(litellm, "token_counter", fake_token_counter)
+    monkeypatch.setattr(app_module, "_token_count_cache", TTLCache())
+    long_text = "hello " * 20
+
+    assert asyncio.run(count_tokens("openai/gpt-4o", long_text)) == len(long_text)
+    assert asyncio.run(count_tokens("openai/gpt-4o", long_text)) == len(long_text)
+    assert asyncio.run(count_tokens("openai/gpt-4o-mini", long_text)) == len(long_text)
+    assert len(calls) == 2
+
+
+def test_count_tokens_skips_cache_for_short_text(monkeypatch):
+    """Short texts should be tokenized directly without caching."""
+    calls = []
+
+    def fake_token_counter(model, text):
+        calls.append((model, text))
+        return len(text)
+
+    monkeypatch.setattr(litellm, "token_counter", fake_token_counter)
+    monkeypatch.setattr(app_module, "_token_count_cache", TTLCache())
+
+    assert asyncio.run(count_tokens("openai/gpt-4o", "hello")) == 5
+    assert asyncio.run(count_tokens("openai/gpt-4o", "hello")) == 5
+    assert len(calls) == 2
+    assert len(app_module._token_count_cache) == 0
+
+
+def test_count_tokens_runs_long_text_off_the_event_loop(monkeypatch):
+    """Uncached counts for long texts should be tokenized in a worker thread."""
+    threads = []
+
+    def fake_token_counter(model, text):
+        threads.append(threading.get_ident())
+        return len(text)
+
+    monkeypatch.setattr(litellm, "token_counter", fake_token_counter)
+    monkeypatch.setattr(app_module, "_token_count_cache", TTLCache())
+
+    async def run():
+        loop_thread = threading.get_ident()
+        await count_tokens("openai/gpt-4o", "hello " * 20)
+        return loop_thread
+
+    loop_thread = asyncio.run(run())
+    assert threads and threads[0] != loop_thread
+
+
+# --- build_system_message() tests ---
+
+
+def test_build_system_message_marks_anthropic_cacheable():
+    """Anthropic system prompts should carry an ephemeral cache_control block."""
+    message = build_system_message("Be concise.", "anthropic/claude-sonnet-4")
+
+    assert message["role"] == "system"
+    assert message["content"] == [
+        {
+            "type": "text",
+            "text": "Be concise.",
+            "cache_control": {"type": "ephemeral"},
+        }
+    ]
+
+
+def test_build_system_message_plain_for_other_providers():
+    """Providers without prompt caching should get a plain string system prompt."""
+    message = build_system_message("Be concise.", "openai/gpt-4o")
+
+    assert message == {"role": "system", "content": "Be concise."}
+
+
+# --- coalesce_deltas() tests ---
+
+
+async def _collect(deltas, **kwargs):
+    return [chunk async for chunk in coalesce_deltas(deltas, **kwargs)]
+
+
+async def _timed_deltas(items):
+    for delay, text in items:
+        await asyncio.sleep(delay)
+        yield text
+
+
+def test_coalesce_deltas_merges_fast_tokens():
+    """Tokens arriving together should be merged after the first one."""
+    deltas = _timed_deltas([(0, "a"), (0, "b"), (0, "c"), (0, "d")])
+
+    chunks = asyncio.run(_collect(deltas, interval=0.05))
+
+    assert chunks == ["a", "bcd"]
+
+
+def test_coalesce_deltas_flushes_on_max_parts():
+    """The buffer should flush once max_parts fragments are collected."""
+    deltas = _timed_deltas([(0, str(i)) for i in range(7)])
+
+    chunks = asyncio.run(_collect(deltas, interval=10, max_parts=3))
+
+    assert chunks == ["0", "123", "456"]
+
+
+def test_coalesce_deltas_flushes_on_max_chars():
+    """The buffer should flush once the buffered text reaches max_chars."""
+    deltas = _timed_deltas([(0, "x"), (0, "aaa"), (0, "bb"), (0, "c")])
+
+    chunks = asyncio.run(_collect(deltas, interval=10, max_chars=5))
+
+    assert chunks == ["x", "aaabb", "c"]
+
+
+def test_coalesce_deltas_flushes_when_stream_stalls():
+    """Buffered text should not wait for the next token after the window."""
+    deltas = _timed_deltas([(0, "a"), (0, "b"), (0.2, "c")])
+
+    chunks = asyncio.run(_collect(deltas, interval=0.02))
+
+    assert chunks == ["a", "b", "c"]
+
+
+def test_coalesce_deltas_propagates_upstream_errors():
+    """An error from the upstream stream should reach the consumer."""
+
+    async def failing_deltas():
+        yield "a"
+        raise RuntimeError("stream broke")
+
+    async def collect():
+        chunks = []
+        with pytest.raises(RuntimeError, match="stream broke"):
+            async for chunk in coalesce_deltas(failing_deltas()):
+                chunks.append(chunk)
+        return chunks
+
+    assert asyncio.run(collect()) == ["a"]
+
+
+# --- iter_content_deltas() tests ---
+
+
+def test_iter_content_deltas_skips_empty_chunks():
+    """Chunks without choices, delta, or content should be skipped."""
+
+    def chunk(content, has_choices=True):
+        delta = SimpleNamespace(content=content)
+        choices = [SimpleNamespace(delta=delta)] if has_choices else []
+        return SimpleNamespace(choices=choices)
+
+    no_delta = SimpleNamespace(choices=[SimpleNamespace(delta=None)])
+
+    async def response():
+        items = [chunk("Hel"), chunk(None), chunk("", False), no_delta, chunk("lo")]
+        for item in items:
+            yield item
+
+    async def collect():
+        return [delta async for delta in iter_content_deltas(response())]
+
+    assert asyncio.run(collect()) == ["Hel", "lo"]
+
+
+# --- encode_message_event() tests ---
+
+
+def test_encode_message_event_matches_server_sent_event():
+    """Pre-encoded message events should match sse_starlette byte for byte."""
+    for content in ["Hello", "", "line one\nline two", "a\r\nb\rc\n", "héllo 👋"]:
+        expected = ServerSentEvent(data=content, event="message").encode()
+        assert encode_message_event(content) == expected
+
+
+# --- get_exa_client() tests ---
+
+
+def test_get_exa_client_reuses_client_per_key():
+    """The same API key should map to one shared Exa client."""
+    get_exa_client.cache_clear()
+
+    first = get_exa_client("exa-key-1")
+
+    assert get_exa_client("exa-key-1") is first
+    assert get_exa_client("exa-key-2") is not first
+    get_exa_client.cache_clear()
+
+
+# --- _extract_json_array() tests ---
+
+
+def test_extract_json_array_unwraps_code_fence():
+    """A fenced JSON array should parse on the strict path."""
+    text = '```json\n["alpha", " beta ", ""]\n```'
+
+    assert app_module._extract_json_array(text) == ["alpha", "beta"]
+
+
+def test_extract_json_array_falls_back_to_bracket_region():
+    """Arrays embedded in prose should still be extracted."""
+    text = 'Here are some ideas: ["a", "b"] - enjoy!'
+
+    assert app_module._extract_json_array(text) == ["a", "b"]
+
+
+# --- get_copilot_headers() tests ---
+
+
+def test_get_copilot_headers_adds_fresh_request_id():
+    """Copilot headers should share the static set but get a new request id."""
+    first = app_module.get_copilot_headers("github_copilot/gpt-4o")
+    second = app_module.get_copilot_headers("github_copilot/gpt-4o")
+
+    assert first["copilot-integration-id"] == "vscode-chat"
+    assert first["x-request-id"] != second["x-request-id"]
+    assert "x-request-id" not in app_module.COPILOT_STATIC_HEADERS
+    assert app_module.get_copilot_headers("openai/gpt-4o") == {}
+
+
+def test_get_copilot_auth_headers_adds_token_without_mutating_constant():
+    """The token header should go on a copy of the shared auth headers."""
+    headers = app_module.get_copilot_auth_headers("gho_abc")
+
+    assert headers["authorization"] == "token gho_abc"
+    assert "authorization" not in app_module.COPILOT_AUTH_HEADERS
+    assert app_module.get_copilot_auth_headers() is app_module.COPILOT_AUTH_HEADERS